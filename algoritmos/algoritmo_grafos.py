@@ -3,163 +3,202 @@ Implementa algoritmos de grafos (Prim, Kruskal, detección de ciclos)
 """
 
 import random
-from heapq import heappush, heappop
+import numpy as np
+from modelos.terreno import TIPOS_TERRENO
+from algoritmos.colas import nueva_cola
+from algoritmos.union_find import UnionFind
+from algoritmos.boruvka import BoruvkaParalelo
 
 
 class AlgoritmosGrafo:
     def __init__(self, mapa_juego):
         self.mapa = mapa_juego
 
-    def prim_mst(self):
-        """Algoritmo de Prim para Árbol de Expansión Mínima"""
-        # Comenzar desde una celda aleatoria no-montaña
-        celdas_validas = [(i, j) for i in range(self.mapa.size)
-                          for j in range(self.mapa.size)
-                          if self.mapa.grid[i, j] != 'MONTAÑA']
+    def aristas_a_celdas(self, aristas):
+        """Convierte un arreglo (E, 2) de ids en la lista [((x, y), (x, y)), ...]"""
+        aristas = np.asarray(aristas, dtype=np.int64).reshape(-1, 2)
+        ux, uy = np.divmod(aristas[:, 0], self.mapa.size)
+        vx, vy = np.divmod(aristas[:, 1], self.mapa.size)
+        return list(zip(zip(ux.tolist(), uy.tolist()), zip(vx.tolist(), vy.tolist())))
 
-        if not celdas_validas:
-            return [], 0
+    def prim_mst(self):
+        """
+        Algoritmo de Prim para Árbol de Expansión Mínima
 
-        inicio = random.choice(celdas_validas)
-        visitados = {inicio}
-        aristas = []
-        monticulo_aristas = []
+        Returns:
+            (aristas, costo_total): aristas es un arreglo (E, 2) de ids
+            (x * size + y) con [padre, hijo] en el orden en que entran al árbol.
+        """
+        # Comenzar desde el inicio del mapa o una celda aleatoria no-montaña
+        transitables = np.flatnonzero(self.mapa.grid.ravel() != TIPOS_TERRENO.MONTAÑA)
+        if not len(transitables):
+            return np.zeros((0, 2), dtype=np.int64), 0
 
-        if self.mapa.inicio and self.mapa.inicio in celdas_validas:
+        if self.mapa.inicio and self.mapa.grid[self.mapa.inicio] != TIPOS_TERRENO.MONTAÑA:
             inicio = self.mapa.inicio
         else:
-            inicio = random.choice(celdas_validas)
-
-            visitados = {inicio}
-            aristas = []
-            monticulo_aristas = [] #cola de prioridad
-
-        # Añadir aristas iniciales
-        for vecino in self.mapa.obtener_vecinos(*inicio):
-            costo = self.mapa.obtener_costo(*vecino)
-            heappush(monticulo_aristas, (costo, inicio, vecino))
-
-        costo_total = 0
-
-        while monticulo_aristas and len(visitados) < len(celdas_validas):
-            costo, del_nodo, al_nodo = heappop(monticulo_aristas)
-
-            if al_nodo in visitados:
-                continue
-
-            visitados.add(al_nodo)
-            aristas.append((del_nodo, al_nodo))
-            costo_total += costo
-
-            #obtenemos los vecinos del nodo recien agregado
-            for vecino in self.mapa.obtener_vecinos(*al_nodo):
-                if vecino not in visitados:
-                    costo_vecino = self.mapa.obtener_costo(*vecino)
-                    heappush(monticulo_aristas, (costo_vecino, al_nodo, vecino))
+            inicio = divmod(int(random.choice(transitables)), self.mapa.size)
 
+        aristas, costo_total, _ = self._prim(inicio)
         return aristas, costo_total
 
-    def prim_mst_conectado(self):
+    def prim_mst_conectado(self, detener_en_meta=False):
         """
         Prim MST que GARANTIZA conectar inicio y meta
+        Con detener_en_meta=True el árbol deja de crecer al alcanzar la meta.
+        Si la meta está en otra región se sabe de entrada: el árbol cubre la
+        región del inicio y conectado es False.
         Retorna: (aristas, costo_total, conectado)
         """
         if not self.mapa.inicio or not self.mapa.meta:
             return self.prim_mst()
 
-        celdas_validas = [(i, j) for i in range(self.mapa.size)
-                          for j in range(self.mapa.size)
-                          if self.mapa.grid[i, j] != 'MONTAÑA']
+        if not np.any(self.mapa.grid != TIPOS_TERRENO.MONTAÑA):
+            return np.zeros((0, 2), dtype=np.int64), 0, False
 
-        if not celdas_validas:
-            return [], 0, False
+        meta = self.mapa.meta
+        if not self.mapa.mismo_componente(self.mapa.inicio, meta):
+            meta = None
+        return self._prim(self.mapa.inicio, meta, detener_en_meta)
 
-        inicio = self.mapa.inicio
-        visitados = {inicio}
-        aristas = []
-        monticulo_aristas = []
+    def _prim(self, inicio, meta=None, detener_en_meta=False):
+        """
+        Prim sobre la adyacencia CSR con arreglos indexados por id de celda
 
-        # Añadir aristas iniciales
-        for vecino in self.mapa.obtener_vecinos(*inicio):
-            costo = self.mapa.obtener_costo(*vecino)
-            heappush(monticulo_aristas, (costo, inicio, vecino))
+        clave[v] es el menor coste conocido para colgar v del árbol y padre[v]
+        la celda del árbol que lo da. Mejorar una clave (decrease-key) vuelve a
+        meter v en la cola; las entradas viejas se descartan al salir. Como
+        entrar a una celda siempre cuesta lo mismo, cada celda entra a la cola
+        una sola vez.
 
-        costo_total = 0
-        meta_alcanzada = (inicio == self.mapa.meta)
+        Returns:
+            (aristas (E, 2) de ids [padre, hijo], costo_total, meta_alcanzada)
+        """
+        indptr, vecinos, costos = self.mapa.obtener_adyacencia().como_listas()
+        size = self.mapa.size
+        infinito = float('inf')
+
+        clave = [infinito] * (size * size)
+        padre = [-1] * (size * size)
+        en_arbol = [False] * (size * size)
+        cola = nueva_cola(TIPOS_TERRENO.COSTOS_ENTEROS) #cola de prioridad
+
+        id_inicio = inicio[0] * size + inicio[1]
+        id_meta = meta[0] * size + meta[1] if meta else -1
+        clave[id_inicio] = 0
+        cola.push(0, id_inicio)
 
-        while monticulo_aristas and len(visitados) < len(celdas_validas):
-            costo, del_nodo, al_nodo = heappop(monticulo_aristas)
+        aristas = []
+        costo_total = 0
+        meta_alcanzada = id_inicio == id_meta
 
-            if al_nodo in visitados:
+        while cola:
+            costo, nodo = cola.pop()
+            if en_arbol[nodo] or costo > clave[nodo]:
                 continue
 
-            visitados.add(al_nodo)
-            aristas.append((del_nodo, al_nodo))
-            costo_total += costo
+            en_arbol[nodo] = True
+            if nodo != id_inicio:
+                aristas.append((padre[nodo], nodo))
+                costo_total += costo
 
-            if al_nodo == self.mapa.meta:
+            if nodo == id_meta:
                 meta_alcanzada = True
+                if detener_en_meta:
+                    break
+
+            #relajar los vecinos del nodo recien agregado
+            for k in range(indptr[nodo], indptr[nodo + 1]):
+                vecino = vecinos[k]
+                if not en_arbol[vecino] and costos[k] < clave[vecino]:
+                    clave[vecino] = costos[k]
+                    padre[vecino] = nodo
+                    cola.push(costos[k], vecino)
 
-            for vecino in self.mapa.obtener_vecinos(*al_nodo):
-                if vecino not in visitados:
-                    costo_vecino = self.mapa.obtener_costo(*vecino)
-                    heappush(monticulo_aristas, (costo_vecino, al_nodo, vecino))
+        return np.array(aristas, dtype=np.int64).reshape(-1, 2), costo_total, meta_alcanzada
 
-        return aristas, costo_total, meta_alcanzada
+    def _aristas_grid(self):
+        """
+        Aristas no dirigidas entre celdas transitables, construidas con NumPy
+
+        Cada celda se une con su vecina derecha y la de abajo; el coste es el
+        de entrar a esa vecina. Quedan ordenadas por (u, v).
+
+        Returns:
+            (u, v, codigos): ids de los extremos (x * size + y) y el código de
+            terreno de v (su coste es TIPOS_TERRENO.COSTOS[codigo]).
+        """
+        grid = self.mapa.grid
+        n = self.mapa.size
+        transitable = grid != TIPOS_TERRENO.MONTAÑA
+        ids = np.arange(n * n, dtype=np.int64).reshape(n, n)
+
+        # [..., 0] = arista a la derecha, [..., 1] = arista hacia abajo
+        validas = np.zeros((n, n, 2), dtype=bool)
+        validas[:, :-1, 0] = transitable[:, :-1] & transitable[:, 1:]
+        validas[:-1, :, 1] = transitable[:-1, :] & transitable[1:, :]
+        vecino = np.stack([ids + 1, ids + n], axis=-1)
+
+        u = np.broadcast_to(ids[..., None], (n, n, 2))[validas]
+        v = vecino[validas]
+        return u, v, grid.ravel()[v]
+
+    def _ordenar_por_costo(self, codigos):
+        """
+        Ordenamiento por conteo (estable) de las aristas según su coste
+
+        Hay muy pocos terrenos distintos: basta una pasada por código, de
+        menor a mayor coste, conservando el orden original dentro de cada uno.
+        """
+        presentes = np.flatnonzero(np.bincount(codigos, minlength=len(TIPOS_TERRENO.COSTOS)))
+        presentes = presentes[np.argsort(TIPOS_TERRENO.COSTOS[presentes], kind='stable')]
+        return np.concatenate([np.flatnonzero(codigos == codigo) for codigo in presentes] or
+                              [np.zeros(0, dtype=np.int64)])
 
     def kruskal_mst(self):
         """Algoritmo de Kruskal para MST usando Union-Find"""
-        celdas_validas = [(i, j) for i in range(self.mapa.size)
-                          for j in range(self.mapa.size)
-                          if self.mapa.grid[i, j] != 'MONTAÑA']
-
-        if not celdas_validas:
+        num_validas = int(np.count_nonzero(self.mapa.grid != TIPOS_TERRENO.MONTAÑA))
+        if not num_validas:
             return [], 0
 
-        # Crear todas las aristas posibles
-        aristas = []
-        for i, j in celdas_validas:
-            for ni, nj in self.mapa.obtener_vecinos(i, j):
-                if (ni, nj) in celdas_validas:
-                    costo = self.mapa.obtener_costo(ni, nj)
-
-                    if self.mapa.inicio and self.mapa.meta:
-                        if (i, j) == self.mapa.inicio or (ni, nj) == self.mapa.inicio:
-                            prioridad_extra = -0.1  # Slight boost
-                        if (i, j) == self.mapa.meta or (ni, nj) == self.mapa.meta:
-                            prioridad_extra = -0.1
-
-                    # Evitar duplicados
-                    if (i, j) < (ni, nj):
-                        aristas.append((costo, (i, j), (ni, nj)))
-
-        # Ordenar aristas por peso
-        aristas.sort()
-
-        # Union-Find
-        padre = {celda: celda for celda in celdas_validas}
-
-        def find(x):
-            if padre[x] != x:
-                padre[x] = find(padre[x])
-            return padre[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                padre[px] = py
-                return True
-            return False
-
-        # Algoritmo de Kruskal
-        aristas_mst = []
-        costo_total = 0
+        # Todas las aristas posibles, ordenadas por peso
+        u, v, codigos = self._aristas_grid()
+        orden = self._ordenar_por_costo(codigos)
+        u, v, codigos = u[orden], v[orden], codigos[orden]
 
-        for costo, u, v in aristas:
-            if union(u, v):
-                aristas_mst.append((u, v))
-                costo_total += costo
-                if len(aristas_mst) == len(celdas_validas) - 1:
-                    break
+        # Union-Find sobre ids de celda (x * size + y)
+        size = self.mapa.size
+        conjuntos = UnionFind(size * size)
+        unidas = conjuntos.union_lote(u, v, max_uniones=num_validas - 1)
+
+        costo_total = self._costo_aristas(codigos[unidas])
+        aristas_mst = self.aristas_a_celdas(np.stack([u[unidas], v[unidas]], axis=1))
 
         return aristas_mst, costo_total
+
+    def boruvka_mst(self, procesos=None):
+        """
+        MST de Borůvka con las franjas del grid repartidas entre procesos
+
+        Mismas aristas candidatas que kruskal_mst y mismos desempates (el
+        orden de Kruskal como peso), así que da el mismo bosque y el mismo coste.
+
+        Args:
+            procesos: Procesos trabajadores (None = todos los núcleos, 1 = sin pool)
+
+        Returns:
+            (aristas, costo_total): aristas es un arreglo (E, 2) de ids (x * size + y)
+        """
+        u, v, codigos = self._aristas_grid()
+        orden = self._ordenar_por_costo(codigos)
+        rango = np.empty_like(orden)
+        rango[orden] = np.arange(len(orden))
+
+        indices = BoruvkaParalelo(u, v, rango, self.mapa.size * self.mapa.size, procesos).resolver()
+        return np.stack([u[indices], v[indices]], axis=1), self._costo_aristas(codigos[indices])
+
+    def _costo_aristas(self, codigos):
+        """Suma de los costes de unas aristas dadas por el código de terreno de su destino"""
+        conteo = np.bincount(codigos, minlength=len(TIPOS_TERRENO.COSTO_POR_CODIGO))
+        return sum(int(veces) * TIPOS_TERRENO.COSTO_POR_CODIGO[codigo]
+                   for codigo, veces in enumerate(conteo) if veces)
@@ -0,0 +1,136 @@
+"""
+MST de Borůvka en paralelo (franjas del grid repartidas entre procesos)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from algoritmos.union_find import UnionFind
+from algoritmos.memoria_compartida import compartido, conectar, compartir
+
+
+def _minimos_franja(inicio, fin):
+    """
+    Arista más barata que sale de cada componente, mirando solo las aristas [inicio, fin)
+
+    Antes compacta la franja en su lugar: las aristas que ya quedaron dentro
+    de una componente no sirven más, así cada ronda recorre menos aristas.
+    Cada trabajador solo escribe en su propia franja.
+
+    Returns:
+        (componentes, rangos, vivas): cada componente con el rango de su arista
+        mínima, y cuántas aristas siguen en la franja (desde inicio)
+    """
+    u = compartido['u'][inicio:fin]
+    v = compartido['v'][inicio:fin]
+    rango = compartido['rango'][inicio:fin]
+    etiqueta = compartido['etiqueta']
+
+    cu, cv = etiqueta[u], etiqueta[v]
+    vivas = np.flatnonzero(cu != cv)
+    cantidad = len(vivas)
+    u[:cantidad] = u[vivas]
+    v[:cantidad] = v[vivas]
+    rango[:cantidad] = rango[vivas]
+
+    rangos = rango[:cantidad]
+    componentes, rangos = _minimo_por_componente(np.concatenate([cu[vivas], cv[vivas]]),
+                                                 np.concatenate([rangos, rangos]), len(etiqueta))
+    return componentes, rangos, cantidad
+
+
+def _minimo_por_componente(componentes, rangos, num_nodos):
+    """Para cada componente, el menor rango entre sus candidatas"""
+    sin_arista = np.iinfo(np.int64).max
+    minimo = np.full(num_nodos, sin_arista, dtype=np.int64)
+    np.minimum.at(minimo, componentes, rangos)
+    presentes = np.flatnonzero(minimo != sin_arista)
+    return presentes, minimo[presentes]
+
+
+class BoruvkaParalelo:
+    def __init__(self, u, v, rango, num_nodos, procesos=None, franjas=None):
+        """
+        Prepara el grafo en memoria compartida
+
+        Args:
+            u, v: Extremos de cada arista, en el orden del grid (fila por fila)
+            rango: Posición de cada arista en el orden de Kruskal; hace únicos
+                   los pesos, así el bosque resultante es exactamente el de Kruskal
+            num_nodos: Cantidad de ids de celda
+            procesos: Procesos trabajadores (None = todos los núcleos, 1 = sin pool)
+            franjas: Cantidad de franjas de aristas (por defecto 4 por proceso)
+        """
+        self.procesos = procesos or os.cpu_count() or 1
+        self.num_nodos = num_nodos
+        self.num_aristas = len(u)
+        self.u, self.v, self.rango = u, v, rango
+
+        cantidad = franjas or self.procesos * 4
+        cortes = np.linspace(0, self.num_aristas, cantidad + 1).astype(np.int64)
+        self.franjas = [(int(a), int(b)) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+    def resolver(self):
+        """
+        Rondas de Borůvka hasta que ninguna componente tenga aristas de salida
+
+        Returns:
+            Índices (en u, v) de las aristas del bosque de expansión mínima
+        """
+        if not self.num_aristas:
+            return np.zeros(0, dtype=np.int64)
+
+        # copias: las franjas se compactan en su lugar durante las rondas
+        arreglos = {'u': self.u.copy(), 'v': self.v.copy(), 'rango': self.rango.copy(),
+                    'etiqueta': np.arange(self.num_nodos, dtype=np.int64)}
+
+        if self.procesos == 1:
+            compartido.update(arreglos)
+            try:
+                return self._rondas(arreglos['etiqueta'],
+                                    lambda franjas: [_minimos_franja(a, b) for a, b in franjas])
+            finally:
+                compartido.clear()
+
+        with compartir(arreglos) as (compartidos, descripciones):
+            with ProcessPoolExecutor(self.procesos, initializer=conectar,
+                                     initargs=(descripciones,)) as pool:
+                def buscar(franjas):
+                    inicios, fines = zip(*franjas)
+                    return list(pool.map(_minimos_franja, inicios, fines))
+                return self._rondas(compartidos['etiqueta'], buscar)
+
+    def _rondas(self, etiqueta, buscar_minimos):
+        """Cada ronda: mínimos por franja (en paralelo), unirlos y contraer componentes"""
+        posicion = np.empty(self.num_aristas, dtype=np.int64)
+        posicion[self.rango] = np.arange(self.num_aristas)  # rango -> índice de arista
+        elegidas = np.zeros(self.num_aristas, dtype=bool)
+        franjas = self.franjas
+
+        while franjas:
+            resultados = buscar_minimos(franjas)
+            franjas = [(a, a + vivas) for (a, _), (_, _, vivas) in zip(franjas, resultados) if vivas]
+            componentes = np.concatenate([c for c, _, _ in resultados])
+            if not len(componentes):
+                break
+            componentes, rangos = _minimo_por_componente(componentes,
+                                                         np.concatenate([r for _, r, _ in resultados]),
+                                                         self.num_nodos)
+
+            # extremos sacados de los arreglos originales (los compartidos se compactan)
+            aristas = posicion[rangos]
+            elegidas[aristas] = True
+
+            # colgar cada componente de la del otro extremo de su arista mínima
+            cu, cv = etiqueta[self.u[aristas]], etiqueta[self.v[aristas]]
+            destino = np.where(cu == componentes, cv, cu)
+            conjuntos = UnionFind(self.num_nodos)
+            conjuntos.padre[componentes] = destino
+
+            # dos componentes que se eligieron mutuamente: la de menor id queda como raíz
+            mutuas = (conjuntos.padre[destino] == componentes) & (componentes < destino)
+            conjuntos.padre[componentes[mutuas]] = componentes[mutuas]
+
+            etiqueta[:] = conjuntos.raices(etiqueta)
+
+        return np.flatnonzero(elegidas)
@@ -0,0 +1,78 @@
+"""
+Búsqueda reanudable: avanza por tramos para no bloquear el bucle de pygame
+"""
+
+from time import perf_counter
+
+
+class BusquedaEnCurso:
+    # cada cuántas expansiones se mira el reloj
+    REVISAR_RELOJ = 64
+
+    def __init__(self, generador, al_terminar=None):
+        """
+        Envuelve un generador de búsqueda de Busquedas
+
+        El generador entrega orden_visitados (la misma lista, cada vez más
+        larga) después de cada expansión y al terminar devuelve la tupla
+        (camino, orden_visitados, frontera, costo_total).
+
+        Args:
+            generador: Generador de búsqueda (p. ej. Busquedas._a_estrella_pasos)
+            al_terminar: Función opcional que recibe el resultado final
+        """
+        self.generador = generador
+        self.al_terminar = al_terminar
+        self.visitados = []  # orden_visitados en vivo, para animar mientras busca
+        self.resultado = None
+        self.terminada = False
+
+    @classmethod
+    def con_resultado(cls, resultado):
+        """Búsqueda ya terminada (p. ej. resultado sacado de la caché)"""
+        busqueda = cls(None)
+        busqueda._finalizar(resultado)
+        return busqueda
+
+    def avanzar(self, max_expansiones=None, max_ms=None):
+        """
+        Trabaja como mucho max_expansiones expansiones o max_ms milisegundos
+
+        Sin límites corre hasta el final. Devuelve True cuando la búsqueda terminó.
+        """
+        if self.terminada:
+            return True
+
+        limite = perf_counter() + max_ms / 1000 if max_ms is not None else None
+        hechas = 0
+        try:
+            while max_expansiones is None or hechas < max_expansiones:
+                self.visitados = next(self.generador)
+                hechas += 1
+                if (limite is not None and hechas % self.REVISAR_RELOJ == 0 and
+                        perf_counter() >= limite):
+                    break
+        except StopIteration as fin:
+            self._finalizar(fin.value)
+        return self.terminada
+
+    def terminar(self):
+        """Corre lo que falte y devuelve el resultado"""
+        self.avanzar()
+        return self.resultado
+
+    def _finalizar(self, resultado):
+        self.resultado = resultado
+        self.visitados = resultado[1]
+        self.terminada = True
+        if self.al_terminar is not None:
+            self.al_terminar(resultado)
+
+
+def agotar(generador):
+    """Corre un generador hasta el final y devuelve lo que retorna"""
+    while True:
+        try:
+            next(generador)
+        except StopIteration as fin:
+            return fin.value
@@ -2,13 +2,33 @@
 Implementa algoritmos de búsqueda de caminos
 """
 
-from heapq import heappush, heappop
 from collections import deque
+import numpy as np
+from modelos.terreno import TIPOS_TERRENO
+from algoritmos.traza import TrazaBusqueda
+from algoritmos.cache_rutas import CacheRutas
+from algoritmos.colas import nueva_cola
+from algoritmos.busqueda_en_curso import BusquedaEnCurso, agotar
 
 
 class Busquedas:
-    def __init__(self, mapa_juego):
+    # compartida por todas las instancias (la UI crea un Busquedas por click)
+    cache = CacheRutas()
+    # nodos fijados entre pausas de dijkstra_completo_pasos
+    NODOS_POR_PASO = 64
+
+    def __init__(self, mapa_juego, modo_traza='ninguna', usar_cache=True):
+        """
+        Args:
+            mapa_juego: Referencia al mapa del juego
+            modo_traza: 'ninguna' (no guarda la frontera) o 'compacta'
+                        (guarda push/pop en una TrazaBusqueda para la animación)
+            usar_cache: Reutilizar resultados de a_estrella/greedy para la
+                        misma versión del mapa, inicio y meta
+        """
         self.mapa = mapa_juego
+        self.modo_traza = modo_traza
+        self.usar_cache = usar_cache
         self.visitados = set()
         self.frontera = []
         self.vino_de = {}
@@ -18,85 +38,695 @@ class Busquedas:
         """Heurística Manhattan para A*"""
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-    def a_estrella(self, inicio, meta):
-        """Algoritmo A* - devuelve camino, nodos visitados y frontera"""
-        self.visitados = set()
-        self.frontera = [] #cola de prioridad
-        self.vino_de = {} #reconstruir el camino
-        self.costo_hasta_ahora = {}
-
-        heappush(self.frontera, (0, inicio))
-        self.vino_de[inicio] = None
-        self.costo_hasta_ahora[inicio] = 0
+    def _nueva_traza(self, ancho, borde=0):
+        """Crea la traza de la frontera si el modo lo pide (None = sin traza)"""
+        if self.modo_traza == 'compacta':
+            return TrazaBusqueda(ancho, borde)
+        return None
+
+    def _nueva_cola(self):
+        """
+        Lista abierta: cola de cubetas si los costes del terreno son enteros
+
+        Con costes enteros y Manhattan todas las prioridades son enteras (o,
+        en la bidireccional, tienen la misma parte fraccionaria), que es lo
+        que necesita la cola de cubetas.
+        """
+        return nueva_cola(TIPOS_TERRENO.COSTOS_ENTEROS)
+
+    def _sin_camino(self, nombre, ancho, borde=0, costo=float('inf')):
+        """Resultado vacío cuando inicio y meta están en regiones distintas (sin buscar)"""
+        print(f"{nombre}: inicio y meta están en regiones distintas, no hay camino")
+        traza = self._nueva_traza(ancho, borde)
+        return [], [], traza if traza is not None else [], costo
+
+    def _clave_cache(self, nombre, inicio, meta, opciones):
+        return (self.mapa.version, inicio, meta, nombre, self.modo_traza) + opciones
+
+    def _con_cache(self, nombre, inicio, meta, buscar, *opciones):
+        """Devuelve el resultado guardado para (versión, inicio, meta, algoritmo) o lo calcula"""
+        if not self.usar_cache:
+            return buscar()
+
+        clave = self._clave_cache(nombre, inicio, meta, opciones)
+        resultado = self.cache.obtener(clave)
+        if resultado is None:
+            resultado = buscar()
+            self.cache.guardar(clave, resultado)
+        return resultado
+
+    def _por_pasos(self, nombre, inicio, meta, generador, *opciones):
+        """BusquedaEnCurso sobre el generador; si ya está en la caché, terminada de entrada"""
+        if not self.usar_cache:
+            return BusquedaEnCurso(generador)
+
+        clave = self._clave_cache(nombre, inicio, meta, opciones)
+        resultado = self.cache.obtener(clave)
+        if resultado is not None:
+            return BusquedaEnCurso.con_resultado(resultado)
+        return BusquedaEnCurso(generador, lambda final: self.cache.guardar(clave, final))
+
+    def a_estrella(self, inicio, meta, usar_landmarks=False):
+        """
+        Algoritmo A* - devuelve camino, nodos visitados y frontera
+
+        La frontera es una TrazaBusqueda en modo 'compacta' y [] sin traza.
+        Con usar_landmarks=True la heurística es la cota ALT de los landmarks
+        del mapa (más ajustada que Manhattan en laberintos).
+        """
+        return self._con_cache('a_estrella', inicio, meta,
+                               lambda: BusquedaEnCurso(self._a_estrella_pasos(inicio, meta, usar_landmarks)).terminar(),
+                               usar_landmarks)
+
+    def a_estrella_por_pasos(self, inicio, meta, usar_landmarks=False):
+        """A* reanudable: devuelve una BusquedaEnCurso que se avanza por tramos"""
+        return self._por_pasos('a_estrella', inicio, meta,
+                               self._a_estrella_pasos(inicio, meta, usar_landmarks), usar_landmarks)
+
+    def _a_estrella_pasos(self, inicio, meta, usar_landmarks):
+        """Generador de A*: entrega orden_visitados tras cada expansión"""
+        if not self.mapa.mismo_componente(inicio, meta):
+            return self._sin_camino('A*', self.mapa.size)
+
+        # estado local (y en self para consultarlo): dos generadores pueden ir intercalados
+        self.visitados = visitados = set()
+        self.frontera = frontera = self._nueva_cola() #cola de prioridad
+        self.vino_de = vino_de = {} #reconstruir el camino
+        self.costo_hasta_ahora = costo_hasta_ahora = {}
+
+        # adyacencia precalculada del mapa (vecinos y costes en listas planas)
+        indptr, vecinos, costos = self.mapa.obtener_adyacencia().como_listas()
+        size = self.mapa.size
+        traza = self._nueva_traza(size)
 
         orden_visitados = []
-        estados_frontera = []
 
-        while self.frontera:
-            prioridad_actual, actual = heappop(self.frontera)
-
-            if actual in self.visitados:
+        heuristica = self.heuristica
+        if usar_landmarks:
+            # si faltan los landmarks se construyen aquí, cediendo el control entre tramos
+            construccion = self.mapa.obtener_landmarks_pasos()
+            while True:
+                try:
+                    next(construccion)
+                except StopIteration as fin:
+                    landmarks = fin.value
+                    break
+                yield orden_visitados
+            cota = landmarks.cota_hacia(meta)
+            heuristica = lambda nodo, _: cota(nodo[0] * size + nodo[1])
+
+        frontera.push(0, inicio)
+        vino_de[inicio] = None
+        costo_hasta_ahora[inicio] = 0
+        if traza is not None:
+            traza.entra(inicio[0] * size + inicio[1])
+
+        while frontera:
+            prioridad_actual, actual = frontera.pop()
+            if traza is not None:
+                traza.sale(actual[0] * size + actual[1])
+
+            if actual in visitados:
                 continue
 
-            self.visitados.add(actual)
+            visitados.add(actual)
             orden_visitados.append(actual)
-            estados_frontera.append([nodo for _, nodo in self.frontera]) #para animacion
+            if traza is not None:
+                traza.marcar() #para animacion
+            yield orden_visitados
 
             if actual == meta:
                 break
 
-            for siguiente_nodo in self.mapa.obtener_vecinos(*actual):
-                if siguiente_nodo in self.visitados:
+            costo_actual = costo_hasta_ahora[actual]
+            nodo = actual[0] * size + actual[1]
+            for k in range(indptr[nodo], indptr[nodo + 1]):
+                siguiente_nodo = divmod(vecinos[k], size)
+                if siguiente_nodo in visitados:
                     continue
 
-                nuevo_costo = self.costo_hasta_ahora[actual] + self.mapa.obtener_costo(*siguiente_nodo)
+                nuevo_costo = costo_actual + costos[k]
 
-                if siguiente_nodo not in self.costo_hasta_ahora or nuevo_costo < self.costo_hasta_ahora[siguiente_nodo]:
-                    self.costo_hasta_ahora[siguiente_nodo] = nuevo_costo
-                    prioridad = nuevo_costo + self.heuristica(siguiente_nodo, meta)
-                    heappush(self.frontera, (prioridad, siguiente_nodo))
-                    self.vino_de[siguiente_nodo] = actual
+                if siguiente_nodo not in costo_hasta_ahora or nuevo_costo < costo_hasta_ahora[siguiente_nodo]:
+                    costo_hasta_ahora[siguiente_nodo] = nuevo_costo
+                    prioridad = nuevo_costo + heuristica(siguiente_nodo, meta)
+                    frontera.push(prioridad, siguiente_nodo)
+                    vino_de[siguiente_nodo] = actual
+                    if traza is not None:
+                        traza.entra(vecinos[k])
 
-        camino = self._reconstruir_camino(inicio, meta)
-        costo_total = self.costo_hasta_ahora.get(meta, float('inf'))
+        camino = self._reconstruir_camino(inicio, meta, vino_de)
+        costo_total = costo_hasta_ahora.get(meta, float('inf'))
 
         print(f"A* exploró {len(orden_visitados)} nodos")
-        return camino, orden_visitados, estados_frontera, costo_total
+        return camino, orden_visitados, traza if traza is not None else [], costo_total
+
+    def a_estrella_rapido(self, inicio, meta):
+        """
+        A* sobre arreglos planos (misma salida que a_estrella)
+
+        Cada celda es un id entero sobre el grid con un borde de montañas,
+        así los vecinos son id + desplazamiento sin revisar límites.
+        g, padre y cerrado son listas planas del mapa (obtener_listas_trabajo)
+        en vez de dicts/sets; al terminar se restauran solo las posiciones
+        tocadas, así que una consulta no paga O(N) antes de buscar.
+        La frontera se registra igual que en a_estrella según modo_traza.
+        """
+        if not self.mapa.mismo_componente(inicio, meta):
+            return self._sin_camino('A* (rápido)', self.mapa.size + 2, borde=1)
+
+        costos, ancho = self._costos_con_borde()
+        infinito = float('inf')
+
+        g, padre, cerrado = self.mapa.obtener_listas_trabajo()
+        tocados = []
+
+        id_inicio = (inicio[0] + 1) * ancho + inicio[1] + 1
+        id_meta = (meta[0] + 1) * ancho + meta[1] + 1
+        meta_x, meta_y = meta[0] + 1, meta[1] + 1
+
+        traza = self._nueva_traza(ancho, borde=1)
+        frontera = self._nueva_cola()
+        frontera.push(0, id_inicio)
+        g[id_inicio] = 0
+        tocados.append(id_inicio)
+        if traza is not None:
+            traza.entra(id_inicio)
+        orden_visitados = []
+
+        try:
+            camino, costo_total = self._a_estrella_plano(frontera, traza, orden_visitados, costos, ancho,
+                                                         g, padre, cerrado, tocados, id_inicio, id_meta,
+                                                         meta_x, meta_y)
+        finally:
+            for nodo in tocados:
+                g[nodo] = infinito
+                padre[nodo] = -1
+                cerrado[nodo] = False
+
+        print(f"A* (rápido) exploró {len(orden_visitados)} nodos")
+        return camino, orden_visitados, traza if traza is not None else [], costo_total
+
+    def _a_estrella_plano(self, frontera, traza, orden_visitados, costos, ancho,
+                          g, padre, cerrado, tocados, id_inicio, id_meta, meta_x, meta_y):
+        """Bucle de a_estrella_rapido sobre las listas de trabajo; devuelve (camino, costo)"""
+        infinito = float('inf')
+        # mismo orden que obtener_vecinos: (0, 1), (1, 0), (0, -1), (-1, 0)
+        desplazamientos = (1, ancho, -1, -ancho)
+
+        while frontera:
+            _, actual = frontera.pop()
+            if traza is not None:
+                traza.sale(actual)
+
+            if cerrado[actual]:
+                continue
+
+            cerrado[actual] = True
+            x, y = divmod(actual, ancho)
+            orden_visitados.append((x - 1, y - 1))
+            if traza is not None:
+                traza.marcar()
+
+            if actual == id_meta:
+                break
+
+            costo_actual = g[actual]
+            for desplazamiento in desplazamientos:
+                siguiente = actual + desplazamiento
+                costo = costos[siguiente]
+                if costo == infinito or cerrado[siguiente]:
+                    continue
+
+                nuevo_costo = costo_actual + costo
+                if nuevo_costo < g[siguiente]:
+                    if g[siguiente] == infinito:
+                        tocados.append(siguiente)
+                    g[siguiente] = nuevo_costo
+                    sx, sy = divmod(siguiente, ancho)
+                    prioridad = nuevo_costo + abs(sx - meta_x) + abs(sy - meta_y)
+                    frontera.push(prioridad, siguiente)
+                    padre[siguiente] = actual
+                    if traza is not None:
+                        traza.entra(siguiente)
+
+        camino = []
+        if g[id_meta] != infinito:
+            actual = id_meta
+            while actual != -1:
+                x, y = divmod(actual, ancho)
+                camino.append((x - 1, y - 1))
+                actual = padre[actual]
+            camino.reverse()
+        return camino, g[id_meta]
+
+    def jps(self, inicio, meta):
+        """
+        Jump Point Search (4 direcciones) respetando los costes del terreno
+
+        Los saltos solo avanzan por tramos de celdas con el mismo coste que la
+        celda de origen. Un salto se detiene en la meta, en la primera celda con
+        otro coste (que luego se expande normalmente) o en una celda con vecino
+        forzado o con un vecino lateral de otro terreno. Orden canónico:
+        primero horizontal y luego vertical, así que los saltos horizontales
+        lanzan saltos verticales en cada paso. La fila y la columna de la meta
+        también son puntos de salto: desde ahí la meta queda en línea recta,
+        y los saltos no siguen de largo hasta la pared. Las paradas verticales
+        están precalculadas por versión del mapa (SaltosJPS), así que cada
+        salto vertical es una consulta y no un recorrido de la columna.
+
+        Devuelve el mismo formato que a_estrella; el camino incluye todas las
+        celdas (no solo los puntos de salto) y orden_visitados son los puntos
+        de salto expandidos.
+        """
+        if not self.mapa.mismo_componente(inicio, meta):
+            return self._sin_camino('JPS', self.mapa.size + 2, borde=1)
+
+        costos, ancho = self._costos_con_borde()
+        infinito = float('inf')
+
+        id_inicio = (inicio[0] + 1) * ancho + inicio[1] + 1
+        id_meta = (meta[0] + 1) * ancho + meta[1] + 1
+        meta_x, meta_y = meta[0] + 1, meta[1] + 1
+        saltos = self.mapa.obtener_saltos_jps()
+
+        def saltar_vertical(nodo, paso, costo_tramo):
+            """Salto en columna (paso = ±ancho), devuelve (punto, coste) o None"""
+            fila = nodo // ancho
+            if paso > 0:
+                punto = saltos.abajo[nodo + paso]
+                if fila < meta_x <= punto // ancho:
+                    punto = nodo + (meta_x - fila) * ancho
+            else:
+                punto = saltos.arriba[nodo + paso]
+                if punto // ancho <= meta_x < fila:
+                    punto = nodo - (fila - meta_x) * ancho
+
+            # todas las celdas antes de la parada tienen el coste del tramo
+            costo = costos[punto]
+            if costo == infinito:
+                return None
+            return punto, (abs(punto // ancho - fila) - 1) * costo_tramo + costo
+
+        def saltar_horizontal(nodo, paso, costo_tramo):
+            """Salto en fila (paso = ±1), prueba saltos verticales en cada celda"""
+            acumulado = 0
+            actual = nodo
+            while True:
+                siguiente = actual + paso
+                costo = costos[siguiente]
+                if costo == infinito:
+                    return None
+                acumulado += costo
+                if costo != costo_tramo or siguiente % ancho == meta_y:
+                    return siguiente, acumulado
+
+                if (saltar_vertical(siguiente, ancho, costo_tramo) or
+                        saltar_vertical(siguiente, -ancho, costo_tramo)):
+                    return siguiente, acumulado
+                actual = siguiente
+
+        traza = self._nueva_traza(ancho, borde=1)
+        frontera = self._nueva_cola()
+        frontera.push(0, id_inicio)
+        g = {id_inicio: 0}
+        padre = {id_inicio: None}
+        direccion = {id_inicio: 0}
+        cerrados = set()
+        if traza is not None:
+            traza.entra(id_inicio)
+        orden_visitados = []
+
+        while frontera:
+            _, actual = frontera.pop()
+            if traza is not None:
+                traza.sale(actual)
+
+            if actual in cerrados:
+                continue
+
+            cerrados.add(actual)
+            x, y = divmod(actual, ancho)
+            orden_visitados.append((x - 1, y - 1))
+            if traza is not None:
+                traza.marcar()
+
+            if actual == id_meta:
+                break
+
+            costo_tramo = costos[actual]
+            for paso in (1, ancho, -1, -ancho):
+                # volver por donde se llegó nunca mejora el camino
+                if paso == -direccion[actual]:
+                    continue
+
+                if paso == 1 or paso == -1:
+                    salto = saltar_horizontal(actual, paso, costo_tramo)
+                else:
+                    salto = saltar_vertical(actual, paso, costo_tramo)
+                if salto is None:
+                    continue
+
+                punto, costo = salto
+                if punto in cerrados:
+                    continue
+
+                nuevo_costo = g[actual] + costo
+                if nuevo_costo < g.get(punto, infinito):
+                    g[punto] = nuevo_costo
+                    padre[punto] = actual
+                    direccion[punto] = paso
+                    px, py = divmod(punto, ancho)
+                    frontera.push(nuevo_costo + abs(px - meta_x) + abs(py - meta_y), punto)
+                    if traza is not None:
+                        traza.entra(punto)
+
+        # reconstruir rellenando las celdas entre puntos de salto
+        camino = []
+        if id_meta in padre:
+            actual = id_meta
+            while padre[actual] is not None:
+                paso = direccion[actual]
+                celda = actual
+                while celda != padre[actual]:
+                    x, y = divmod(celda, ancho)
+                    camino.append((x - 1, y - 1))
+                    celda -= paso
+                actual = padre[actual]
+            camino.append(inicio)
+            camino.reverse()
+        costo_total = g.get(id_meta, infinito)
+
+        print(f"JPS exploró {len(orden_visitados)} nodos")
+        return camino, orden_visitados, traza if traza is not None else [], costo_total
+
+    def bidireccional(self, inicio, meta, usar_heuristica=True):
+        """
+        A* bidireccional (o Dijkstra bidireccional si usar_heuristica=False)
+
+        Entrar a una celda cuesta su terreno, así que la arista u -> v cuesta
+        costo(v). La búsqueda hacia atrás parte de la meta y al expandir v
+        relaja sus predecesores u con ese mismo costo(v).
+
+        Usa potenciales promedio p(v) = (h(v, meta) - h(inicio, v)) / 2 para
+        que ambas direcciones sean consistentes; así puede detenerse cuando
+        tope_adelante + tope_atras >= mejor costo encontrado.
+        """
+        return BusquedaEnCurso(self._bidireccional_pasos(inicio, meta, usar_heuristica)).terminar()
+
+    def bidireccional_por_pasos(self, inicio, meta, usar_heuristica=True):
+        """Bidireccional reanudable: devuelve una BusquedaEnCurso"""
+        return BusquedaEnCurso(self._bidireccional_pasos(inicio, meta, usar_heuristica))
+
+    def _bidireccional_pasos(self, inicio, meta, usar_heuristica):
+        """Generador de la bidireccional: entrega orden_visitados tras cada expansión"""
+        if not self.mapa.mismo_componente(inicio, meta):
+            return self._sin_camino('Bidireccional', self.mapa.size)
+
+        indptr, vecinos, costos = self.mapa.obtener_adyacencia().como_listas()
+        size = self.mapa.size
+        infinito = float('inf')
+        traza = self._nueva_traza(size)
+
+        id_inicio = inicio[0] * size + inicio[1]
+        id_meta = meta[0] * size + meta[1]
+
+        def potencial(nodo):
+            if not usar_heuristica:
+                return 0
+            x, y = divmod(nodo, size)
+            a_meta = abs(x - meta[0]) + abs(y - meta[1])
+            desde_inicio = abs(x - inicio[0]) + abs(y - inicio[1])
+            return (a_meta - desde_inicio) / 2
+
+        # índice 0 = hacia adelante (desde inicio), 1 = hacia atrás (desde meta)
+        g = ({id_inicio: 0}, {id_meta: 0})
+        padre = ({id_inicio: None}, {id_meta: None})
+        cerrados = (set(), set())
+        fronteras = (self._nueva_cola(), self._nueva_cola())
+        fronteras[0].push(potencial(id_inicio), id_inicio)
+        fronteras[1].push(-potencial(id_meta), id_meta)
+        if traza is not None:
+            traza.entra(id_inicio)
+            traza.entra(id_meta)
+
+        mejor_costo = 0 if id_inicio == id_meta else infinito
+        encuentro = id_inicio if id_inicio == id_meta else None
+        orden_visitados = []
+
+        while fronteras[0] and fronteras[1]:
+            if fronteras[0].minimo() + fronteras[1].minimo() >= mejor_costo:
+                break
+
+            # expandir el lado con la frontera más pequeña
+            lado = 0 if len(fronteras[0]) <= len(fronteras[1]) else 1
+            _, actual = fronteras[lado].pop()
+            if traza is not None:
+                traza.sale(actual)
+
+            if actual in cerrados[lado]:
+                continue
+
+            cerrados[lado].add(actual)
+            orden_visitados.append(divmod(actual, size))
+            if traza is not None:
+                traza.marcar()
+            yield orden_visitados
+
+            g_lado, g_otro = g[lado], g[1 - lado]
+            costo_actual = g_lado[actual]
+            signo = 1 if lado == 0 else -1
+            if lado == 1:
+                costo_atras = self.mapa.obtener_costo(*divmod(actual, size))
+            for k in range(indptr[actual], indptr[actual + 1]):
+                siguiente = vecinos[k]
+                if siguiente in cerrados[lado]:
+                    continue
+
+                # adelante se paga el terreno del vecino, atrás el del nodo actual
+                nuevo_costo = costo_actual + (costos[k] if lado == 0 else costo_atras)
+                if nuevo_costo < g_lado.get(siguiente, infinito):
+                    g_lado[siguiente] = nuevo_costo
+                    padre[lado][siguiente] = actual
+                    fronteras[lado].push(nuevo_costo + signo * potencial(siguiente), siguiente)
+                    if traza is not None:
+                        traza.entra(siguiente)
+
+                    if siguiente in g_otro and nuevo_costo + g_otro[siguiente] < mejor_costo:
+                        mejor_costo = nuevo_costo + g_otro[siguiente]
+                        encuentro = siguiente
+
+        camino = []
+        if encuentro is not None:
+            actual = encuentro
+            while actual is not None:
+                camino.append(divmod(actual, size))
+                actual = padre[0][actual]
+            camino.reverse()
+            actual = padre[1][encuentro]
+            while actual is not None:
+                camino.append(divmod(actual, size))
+                actual = padre[1][actual]
+
+        print(f"Bidireccional exploró {len(orden_visitados)} nodos")
+        return camino, orden_visitados, traza if traza is not None else [], mejor_costo
+
+    def dijkstra_completo(self, origenes, hacia_origen=False):
+        """
+        Dijkstra sobre todo el mapa desde una o varias celdas origen
+
+        Args:
+            origenes: Lista de celdas (x, y) con distancia 0
+            hacia_origen: False = d(origen, v), coste de ir del origen a cada celda
+                          True = d(v, origen), coste de ir de cada celda al origen
+
+        Returns:
+            (distancias, padres): arreglos NumPy indexados por id = x * size + y.
+            padres[v] es la celda anterior en el camino desde el origen, o la
+            siguiente hacia el origen si hacia_origen=True (-1 = ninguna).
+        """
+        return agotar(self.dijkstra_completo_pasos(origenes, hacia_origen))
+
+    def dijkstra_completo_pasos(self, origenes, hacia_origen=False):
+        """
+        Generador de dijkstra_completo: cede el control cada NODOS_POR_PASO
+        nodos fijados y al terminar devuelve (distancias, padres)
+        """
+        indptr, vecinos, costos = self.mapa.obtener_adyacencia().como_listas()
+        size = self.mapa.size
+        infinito = float('inf')
+        costo_celda = self.mapa.obtener_costos().ravel().tolist()
+
+        distancias = [infinito] * (size * size)
+        padres = [-1] * (size * size)
+        frontera = self._nueva_cola()
+        for x, y in origenes:
+            nodo = x * size + y
+            distancias[nodo] = 0
+            frontera.push(0, nodo)
+
+        fijados = 0
+        while frontera:
+            distancia, actual = frontera.pop()
+            if distancia > distancias[actual]:
+                continue
+
+            fijados += 1
+            if fijados % self.NODOS_POR_PASO == 0:
+                yield
+
+            # hacia el origen se paga el terreno de la celda a la que se llega (actual)
+            costo_atras = costo_celda[actual]
+            for k in range(indptr[actual], indptr[actual + 1]):
+                siguiente = vecinos[k]
+                nueva = distancia + (costo_atras if hacia_origen else costos[k])
+                if nueva < distancias[siguiente]:
+                    distancias[siguiente] = nueva
+                    padres[siguiente] = actual
+                    frontera.push(nueva, siguiente)
+
+        return np.array(distancias), np.array(padres, dtype=np.int64)
+
+    def rutas_lote(self, consultas):
+        """
+        Resuelve muchas consultas (inicio, meta) compartiendo campos de Dijkstra
+
+        Agrupa las consultas por inicio o por meta (el lado con menos celdas
+        distintas) y hace un solo dijkstra_completo por grupo; los caminos del
+        grupo se sacan siguiendo los padres de todos a la vez.
+
+        Args:
+            consultas: Secuencia de pares ((x0, y0), (x1, y1)) o arreglo (Q, 2, 2)
+
+        Returns:
+            (costos, indptr, celdas): costos[q] es el coste de la consulta q
+            (inf = sin camino) y su camino es celdas[indptr[q]:indptr[q + 1]],
+            un arreglo (M, 2) de celdas (x, y) de inicio a meta.
+        """
+        consultas = np.asarray(consultas, dtype=np.int64).reshape(-1, 2, 2)
+        size = self.mapa.size
+        ids = consultas[:, :, 0] * size + consultas[:, :, 1]
+        total = len(ids)
+
+        # agrupar por meta si hay menos metas distintas (Dijkstra hacia la meta)
+        por_meta = len(np.unique(ids[:, 1])) < len(np.unique(ids[:, 0]))
+        lado = 1 if por_meta else 0
+        orden = np.argsort(ids[:, lado], kind='stable')
+        grupos, comienzos = np.unique(ids[orden, lado], return_index=True)
+
+        costos = np.full(total, np.inf)
+        longitudes = np.zeros(total, dtype=np.int64)
+        tramos = []  # (indices de las consultas, ids de sus caminos concatenados)
+
+        regiones = self.mapa.obtener_componentes().etiquetas.ravel()
+        busquedas = 0
+        for grupo, indices in zip(grupos, np.split(orden, comienzos[1:])):
+            # ninguna consulta del grupo tiene camino: no hace falta el Dijkstra
+            if regiones[grupo] < 0 or not (regiones[ids[indices, 1 - lado]] == regiones[grupo]).any():
+                continue
+
+            distancias, padres = self.dijkstra_completo([divmod(int(grupo), size)],
+                                                        hacia_origen=por_meta)
+            busquedas += 1
+            extremos = ids[indices, 1 - lado]
+            costos[indices] = distancias[extremos]
+
+            # seguir padres desde el otro extremo (-1 = camino terminado)
+            actual = np.where(np.isfinite(costos[indices]), extremos, -1)
+            pasos = []
+            while (actual >= 0).any():
+                pasos.append(actual)
+                actual = np.where(actual >= 0, padres[np.maximum(actual, 0)], -1)
+
+            matriz = np.stack(pasos, axis=1) if pasos else np.full((len(indices), 0), -1)
+            if not por_meta:
+                # los padres van de la meta al inicio: invertir cada fila
+                matriz = matriz[:, ::-1]
+            validos = matriz >= 0
+            longitudes[indices] = validos.sum(axis=1)
+            tramos.append((indices, matriz[validos]))
+
+        indptr = np.zeros(total + 1, dtype=np.int64)
+        np.cumsum(longitudes, out=indptr[1:])
+        celdas_ids = np.empty(indptr[-1], dtype=np.int64)
+        for indices, camino_ids in tramos:
+            # posición de cada celda = comienzo de su consulta + desplazamiento dentro del camino
+            largo = longitudes[indices]
+            locales = np.arange(len(camino_ids)) - np.repeat(np.cumsum(largo) - largo, largo)
+            celdas_ids[np.repeat(indptr[indices], largo) + locales] = camino_ids
+
+        print(f"Lote: {total} consultas con {busquedas} búsquedas de Dijkstra")
+        return costos, indptr, np.stack(np.divmod(celdas_ids, size), axis=1)
+
+    def _costos_con_borde(self):
+        """
+        Costes del mapa con un borde infinito alrededor, aplanados en una lista
+
+        Devuelve (costos, ancho): la celda (x, y) tiene id (x + 1) * ancho + (y + 1).
+        Es la lista del mapa (una por versión): no se debe modificar.
+        """
+        return self.mapa.obtener_costos_con_borde()
 
     def greedy(self, inicio, meta):
         """Búsqueda Ávida (Greedy Best-First Search)"""
-        self.visitados = set()
-        self.frontera = []
-        self.vino_de = {}
+        return self._con_cache('greedy', inicio, meta,
+                               lambda: BusquedaEnCurso(self._greedy_pasos(inicio, meta)).terminar())
+
+    def greedy_por_pasos(self, inicio, meta):
+        """Greedy reanudable: devuelve una BusquedaEnCurso"""
+        return self._por_pasos('greedy', inicio, meta, self._greedy_pasos(inicio, meta))
+
+    def _greedy_pasos(self, inicio, meta):
+        """Generador de Greedy: entrega orden_visitados tras cada expansión"""
+        if not self.mapa.mismo_componente(inicio, meta):
+            return self._sin_camino('Greedy', self.mapa.size, costo=0)
+
+        self.visitados = visitados = set()
+        # la prioridad es solo Manhattan: siempre entera
+        self.frontera = frontera = nueva_cola(True)
+        self.vino_de = vino_de = {}
+
+        indptr, vecinos, _ = self.mapa.obtener_adyacencia().como_listas()
+        size = self.mapa.size
+        traza = self._nueva_traza(size)
 
-        heappush(self.frontera, (0, inicio))
-        self.vino_de[inicio] = None
+        frontera.push(0, inicio)
+        vino_de[inicio] = None
+        if traza is not None:
+            traza.entra(inicio[0] * size + inicio[1])
 
         orden_visitados = []
-        estados_frontera = []
 
-        while self.frontera:
-            _, actual = heappop(self.frontera)
+        while frontera:
+            _, actual = frontera.pop()
+            if traza is not None:
+                traza.sale(actual[0] * size + actual[1])
 
             #verificar si ya esta visitado
-            if actual in self.visitados:
+            if actual in visitados:
                 continue
 
-            self.visitados.add(actual)
+            visitados.add(actual)
             orden_visitados.append(actual)
-            estados_frontera.append([nodo for _, nodo in self.frontera])
+            if traza is not None:
+                traza.marcar()
+            yield orden_visitados
 
             if actual == meta:
                 break
 
-            for siguiente_nodo in self.mapa.obtener_vecinos(*actual):
-                if siguiente_nodo not in self.vino_de:
+            nodo = actual[0] * size + actual[1]
+            for k in range(indptr[nodo], indptr[nodo + 1]):
+                siguiente_nodo = divmod(vecinos[k], size)
+                if siguiente_nodo not in vino_de:
                     # Solo usa heurística (diferencia clave con A*)
                     prioridad = self.heuristica(siguiente_nodo, meta)
-                    heappush(self.frontera, (prioridad, siguiente_nodo))
-                    self.vino_de[siguiente_nodo] = actual
+                    frontera.push(prioridad, siguiente_nodo)
+                    vino_de[siguiente_nodo] = actual
+                    if traza is not None:
+                        traza.entra(vecinos[k])
 
-        camino = self._reconstruir_camino(inicio, meta)
+        camino = self._reconstruir_camino(inicio, meta, vino_de)
 
         # Calcular el coste real del camino
         costo_total = 0
@@ -105,7 +735,7 @@ class Busquedas:
                 costo_total += self.mapa.obtener_costo(*camino[i + 1])
 
         print(f"Greedy: exploró {len(orden_visitados)} nodos")
-        return camino, orden_visitados, estados_frontera, costo_total
+        return camino, orden_visitados, traza if traza is not None else [], costo_total
 
     """def bfs(self, inicio, meta):
         #Búsqueda en Amplitud (BFS)
@@ -144,15 +774,17 @@ class Busquedas:
 
         return camino, orden_visitados, estados_frontera, costo_total"""
 
-    def _reconstruir_camino(self, inicio, meta):
+    def _reconstruir_camino(self, inicio, meta, vino_de=None):
         """Reconstruye el camino desde la meta hasta el inicio"""
-        if meta not in self.vino_de:
+        if vino_de is None:
+            vino_de = self.vino_de
+        if meta not in vino_de:
             return []
 
         camino = []
         actual = meta
         while actual is not None:
             camino.append(actual)
-            actual = self.vino_de[actual]
+            actual = vino_de[actual]
         camino.reverse()
         return camino
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Caché LRU de resultados de búsquedas, por versión del mapa
+"""
+
+from collections import OrderedDict
+
+
+class CacheRutas:
+    # tamaño aproximado de una celda (x, y) guardada en una lista de Python
+    BYTES_POR_CELDA = 72
+
+    def __init__(self, max_entradas=256, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            max_entradas: Máximo de consultas guardadas
+            max_bytes: Memoria aproximada máxima de los resultados guardados
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.entradas = OrderedDict()  # {clave: (resultado, bytes)}
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """
+        Devuelve el resultado guardado (y lo marca como reciente) o None
+
+        camino y visitados son tuplas compartidas (no se pueden modificar), así
+        que un acierto no copia nada proporcional a la búsqueda; solo la traza
+        se copia para que cada llamador tenga su propio cursor de reproducción.
+        """
+        entrada = self.entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self.entradas.move_to_end(clave)
+        self.aciertos += 1
+        camino, visitados, frontera, costo = entrada[0]
+        if hasattr(frontera, 'copia'):
+            frontera = frontera.copia()
+        return camino, visitados, frontera, costo
+
+    def guardar(self, clave, resultado):
+        """
+        Guarda un resultado congelado; la clave empieza por la versión del mapa
+
+        Las entradas de versiones anteriores no se purgan: otro MapaJuego vivo
+        puede seguir en esa versión (todas las instancias de Busquedas
+        comparten la caché). Las que ya nadie consulta salen por LRU o por
+        el límite de memoria.
+        """
+        resultado = self._congelar(resultado)
+        tamano = self._estimar_bytes(resultado)
+        if tamano > self.max_bytes:
+            return
+
+        if clave in self.entradas:
+            self._eliminar(clave)
+        self.entradas[clave] = (resultado, tamano)
+        self.bytes_usados += tamano
+
+        while len(self.entradas) > self.max_entradas or self.bytes_usados > self.max_bytes:
+            self._eliminar(next(iter(self.entradas)))
+
+    def limpiar(self):
+        self.entradas.clear()
+        self.bytes_usados = 0
+
+    def _congelar(self, resultado):
+        """(camino, visitados, frontera, costo) sin nada modificable compartido con quien buscó"""
+        camino, visitados, frontera, costo = resultado
+        if hasattr(frontera, 'copia'):
+            frontera = frontera.copia()  # TrazaBusqueda: su propio cursor de reproducción
+        else:
+            frontera = tuple(frontera)
+        return tuple(camino), tuple(visitados), frontera, costo
+
+    def _eliminar(self, clave):
+        _, tamano = self.entradas.pop(clave)
+        self.bytes_usados -= tamano
+
+    def _estimar_bytes(self, resultado):
+        """Memoria aproximada de (camino, visitados, frontera, costo)"""
+        camino, visitados, frontera, _ = resultado
+        tamano = (len(camino) + len(visitados)) * self.BYTES_POR_CELDA
+        if hasattr(frontera, 'eventos'):
+            # TrazaBusqueda: arreglos planos
+            tamano += (frontera.eventos.itemsize * len(frontera.eventos) +
+                       frontera.nodos.itemsize * len(frontera.nodos) +
+                       frontera.marcas.itemsize * len(frontera.marcas))
+        return tamano
@@ -0,0 +1,60 @@
+"""
+Campo de flujo hacia una meta (muchos agentes persiguiendo el mismo objetivo)
+"""
+
+import numpy as np
+from algoritmos.busquedas import Busquedas
+
+
+class CampoFlujo:
+    def __init__(self, mapa_juego, meta):
+        """
+        Calcula en una pasada el campo de integración y las direcciones hacia la meta
+
+        El campo de integración es d(celda, meta) con los costes del terreno
+        (un Dijkstra desde la meta hacia atrás). Cada celda guarda el paso
+        (dx, dy) que la acerca a la meta; la meta y las celdas sin camino
+        tienen (0, 0).
+
+        Args:
+            mapa_juego: Referencia al mapa del juego
+            meta: Celda (x, y) a la que van todos los agentes
+        """
+        self.meta = meta
+        self.size = mapa_juego.size
+        size = self.size
+
+        distancias, padres = Busquedas(mapa_juego).dijkstra_completo([meta], hacia_origen=True)
+        ids = np.arange(size * size)
+        siguiente = np.where(padres >= 0, padres, ids)
+
+        self.integracion = distancias.reshape(size, size)
+        direcciones = np.stack([siguiente // size - ids // size,
+                                siguiente % size - ids % size], axis=1)
+        self.direcciones = direcciones.reshape(size, size, 2).astype(np.int8)
+
+        # lista plana para consultar un agente sin pasar por NumPy
+        self._siguiente = siguiente.tolist()
+
+    def siguiente(self, celda):
+        """Celda a la que debe moverse un agente en celda (ella misma si no hay paso)"""
+        return divmod(self._siguiente[celda[0] * self.size + celda[1]], self.size)
+
+    def mover(self, posiciones):
+        """Avanza un paso a muchos agentes a la vez: posiciones es un arreglo (A, 2)"""
+        posiciones = np.asarray(posiciones)
+        return posiciones + self.direcciones[posiciones[:, 0], posiciones[:, 1]]
+
+    def costo(self, celda):
+        """Coste del camino de celda a la meta (inf = sin camino)"""
+        return float(self.integracion[celda])
+
+    def camino_desde(self, celda):
+        """Camino completo de celda a la meta siguiendo el campo ([] si no hay)"""
+        if self.costo(celda) == float('inf'):
+            return []
+
+        camino = [celda]
+        while camino[-1] != self.meta:
+            camino.append(self.siguiente(camino[-1]))
+        return camino
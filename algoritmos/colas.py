@@ -0,0 +1,86 @@
+"""
+Colas de prioridad intercambiables para las búsquedas (listas abiertas)
+"""
+
+from heapq import heappush, heappop
+
+
+class ColaBinaria:
+    """Montículo binario (heapq): sirve para cualquier prioridad"""
+
+    def __init__(self):
+        self.monticulo = []
+
+    def push(self, prioridad, elemento):
+        heappush(self.monticulo, (prioridad, elemento))
+
+    def pop(self):
+        """Saca el elemento de menor prioridad y devuelve (prioridad, elemento)"""
+        return heappop(self.monticulo)
+
+    def minimo(self):
+        """Prioridad más baja de la cola, sin sacarla"""
+        return self.monticulo[0][0]
+
+    def __len__(self):
+        return len(self.monticulo)
+
+
+class ColaCubetas:
+    """
+    Cola de cubetas (Dial) para prioridades enteras
+
+    Cada prioridad tiene su propia cubeta y un cursor recuerda la menor
+    prioridad que puede estar ocupada. En A*/Dijkstra las prioridades casi
+    nunca bajan y saltan como mucho el coste de una arista, así que push y
+    pop son O(1). Si se mete una prioridad menor que el cursor (Greedy,
+    Prim), el cursor retrocede y la cola sigue siendo correcta.
+    Dentro de una cubeta sale primero el último en entrar.
+    """
+
+    def __init__(self):
+        self.cubetas = {}     # {prioridad: [elementos]}
+        self.cursor = None    # ninguna cubeta ocupada por debajo
+        self.tamano = 0
+
+    def push(self, prioridad, elemento):
+        cubeta = self.cubetas.get(prioridad)
+        if cubeta is None:
+            self.cubetas[prioridad] = [elemento]
+            if self.cursor is None or prioridad < self.cursor:
+                self.cursor = prioridad
+        else:
+            cubeta.append(elemento)
+        self.tamano += 1
+
+    def pop(self):
+        """Saca el elemento de menor prioridad y devuelve (prioridad, elemento)"""
+        if not self.tamano:
+            raise IndexError('pop de una cola vacía')
+
+        prioridad = self.minimo()
+        cubeta = self.cubetas[prioridad]
+        elemento = cubeta.pop()
+        if not cubeta:
+            del self.cubetas[prioridad]
+        self.tamano -= 1
+        if not self.tamano:
+            self.cursor = None
+        return prioridad, elemento
+
+    def minimo(self):
+        """Prioridad más baja de la cola, sin sacarla"""
+        prioridad = self.cursor
+        cubetas = self.cubetas
+        while prioridad not in cubetas:
+            prioridad += 1
+        self.cursor = prioridad
+        return prioridad
+
+    def __len__(self):
+        return self.tamano
+
+
+def nueva_cola(prioridades_enteras):
+    """Cola de cubetas si todas las prioridades serán enteras, montículo si no"""
+    return ColaCubetas() if prioridades_enteras else ColaBinaria()
@@ -0,0 +1,173 @@
+"""
+Planificador incremental (D* Lite para objetivo móvil)
+"""
+
+from heapq import heappush, heappop
+
+
+class DStarLite:
+    def __init__(self, mapa_juego, inicio, meta):
+        """
+        Planificador que conserva su estado entre llamadas
+
+        Busca hacia adelante desde inicio (Tom) hasta meta (Jerry), como LPA*.
+        Cuando la meta se mueve, en vez de reordenar la cola se suma
+        h(meta_vieja, meta_nueva) a km (igual que D* Lite con el agente);
+        cuando cambian celdas o el inicio, solo se corrige el rhs de los
+        nodos afectados y planear() repara el árbol a partir de ahí.
+        """
+        self.mapa = mapa_juego
+        self.inicio = inicio
+        self.meta = meta
+        self.km = 0
+
+        self.g = {}
+        self.rhs = {inicio: 0}
+        self.padre = {inicio: None}
+        self.cola = []
+        self.en_cola = {}  # {nodo: clave vigente}
+        self._encolar(inicio)
+
+    def planear(self):
+        """
+        Repara el árbol de búsqueda hasta que el camino a la meta es óptimo
+
+        Devuelve el mismo formato que Busquedas.a_estrella; orden_visitados
+        son solo los nodos expandidos en esta llamada.
+        """
+        orden_visitados = []
+
+        while self.cola:
+            clave, actual = self.cola[0]
+            if self.en_cola.get(actual) != clave:
+                heappop(self.cola)  # entrada obsoleta
+                continue
+
+            meta_consistente = self._g(self.meta) == self._rhs(self.meta)
+            if clave >= self._clave(self.meta) and meta_consistente:
+                break
+
+            heappop(self.cola)
+            del self.en_cola[actual]
+
+            clave_nueva = self._clave(actual)
+            if clave < clave_nueva:
+                self._encolar(actual)
+                continue
+
+            orden_visitados.append(actual)
+            if self._g(actual) > self._rhs(actual):
+                # sobreconsistente: fijar g y mejorar a los sucesores
+                self.g[actual] = self.rhs[actual]
+                for sucesor in self._vecinos(actual):
+                    nuevo = self.g[actual] + self.mapa.obtener_costo(*sucesor)
+                    if sucesor != self.inicio and nuevo < self._rhs(sucesor):
+                        self.rhs[sucesor] = nuevo
+                        self.padre[sucesor] = actual
+                        self._actualizar_vertice(sucesor)
+            else:
+                # subconsistente: invalidar y recalcular a los que dependían de él
+                self.g[actual] = float('inf')
+                for sucesor in self._vecinos(actual):
+                    if sucesor != self.inicio and self.padre.get(sucesor) == actual:
+                        self._recalcular_rhs(sucesor)
+                        self._actualizar_vertice(sucesor)
+                self._actualizar_vertice(actual)
+
+        camino = self._extraer_camino()
+        costo_total = self._rhs(self.meta)
+        print(f"D* Lite expandió {len(orden_visitados)} nodos")
+        return camino, orden_visitados, [], costo_total
+
+    def mover_meta(self, nueva_meta):
+        """La meta (Jerry) se movió: ajustar km en vez de reordenar la cola"""
+        if nueva_meta == self.meta:
+            return
+        self.km += self._h(self.meta, nueva_meta)
+        self.meta = nueva_meta
+
+    def mover_inicio(self, nuevo_inicio):
+        """El inicio (Tom) se movió: nueva raíz del árbol de búsqueda"""
+        if nuevo_inicio == self.inicio:
+            return
+        viejo = self.inicio
+        self.inicio = nuevo_inicio
+
+        self.rhs[nuevo_inicio] = 0
+        self.padre[nuevo_inicio] = None
+        self._actualizar_vertice(nuevo_inicio)
+
+        self._recalcular_rhs(viejo)
+        self._actualizar_vertice(viejo)
+
+    def actualizar_celdas(self, celdas):
+        """
+        Avisar que cambió el terreno de unas celdas (ya modificadas en el mapa)
+
+        Entrar a una celda cuesta su terreno, así que solo cambian las aristas
+        que entran a cada celda y basta con recalcular su rhs.
+        """
+        for celda in celdas:
+            if celda != self.inicio:
+                self._recalcular_rhs(celda)
+                self._actualizar_vertice(celda)
+
+    def _recalcular_rhs(self, nodo):
+        """rhs(nodo) = min sobre predecesores de g(p) + costo(nodo)"""
+        mejor, mejor_padre = float('inf'), None
+        costo = self.mapa.obtener_costo(*nodo)
+        if costo != float('inf'):
+            for predecesor in self._vecinos(nodo):
+                valor = self._g(predecesor) + costo
+                if valor < mejor:
+                    mejor, mejor_padre = valor, predecesor
+        self.rhs[nodo] = mejor
+        self.padre[nodo] = mejor_padre
+
+    def _actualizar_vertice(self, nodo):
+        """Encola el nodo si es inconsistente (g != rhs) y lo saca si no"""
+        if self._g(nodo) != self._rhs(nodo):
+            self._encolar(nodo)
+        else:
+            self.en_cola.pop(nodo, None)
+
+    def _encolar(self, nodo):
+        clave = self._clave(nodo)
+        self.en_cola[nodo] = clave
+        heappush(self.cola, (clave, nodo))
+
+    def _clave(self, nodo):
+        minimo = min(self._g(nodo), self._rhs(nodo))
+        return (minimo + self._h(nodo, self.meta) + self.km, minimo)
+
+    def _g(self, nodo):
+        return self.g.get(nodo, float('inf'))
+
+    def _rhs(self, nodo):
+        return self.rhs.get(nodo, float('inf'))
+
+    def _h(self, a, b):
+        """Manhattan (admisible: toda celda transitable cuesta al menos 1)"""
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _vecinos(self, nodo):
+        """Vecinos dentro del mapa (sin usar la adyacencia cacheada, que se invalida al editar)"""
+        x, y = nodo
+        size = self.mapa.size
+        return [(x + dx, y + dy) for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+                if 0 <= x + dx < size and 0 <= y + dy < size]
+
+    def _extraer_camino(self):
+        """Sigue los padres desde la meta hasta el inicio"""
+        if self._rhs(self.meta) == float('inf'):
+            return []
+
+        camino = []
+        actual = self.meta
+        while actual is not None:
+            camino.append(actual)
+            if len(camino) > self.mapa.size * self.mapa.size:
+                return []  # padres inconsistentes, no debería ocurrir
+            actual = self.padre.get(actual)
+        camino.reverse()
+        return camino
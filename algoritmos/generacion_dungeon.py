@@ -1,5 +1,7 @@
 import random
 import numpy as np
+from modelos.terreno import TIPOS_TERRENO
+from algoritmos.union_find import UnionFind
 
 
 class GeneradorDungeon:
@@ -17,7 +19,7 @@ class GeneradorDungeon:
         2. Usa MST para conectarlas con pasillos
         3. Agrega enemigos y obstáculos
         """
-        grid = np.full((self.tamano, self.tamano), 'MONTAÑA', dtype=object)
+        grid = np.full((self.tamano, self.tamano), TIPOS_TERRENO.MONTAÑA, dtype=np.uint8)
 
         # Generar salas
         salas = []
@@ -59,7 +61,7 @@ class GeneradorDungeon:
         x, y, ancho, alto = sala
         for i in range(x, x + ancho):
             for j in range(y, y + alto):
-                grid[i, j] = 'LLANURA'
+                grid[i, j] = TIPOS_TERRENO.LLANURA
 
     def _conectar_salas_mst(self, grid, salas):
         """Conecta salas usando Minimum Spanning Tree"""
@@ -79,23 +81,13 @@ class GeneradorDungeon:
 
         # MST con Kruskal
         aristas.sort()
-        padre = list(range(len(salas)))
-
-        def find(x):
-            if padre[x] != x:
-                padre[x] = find(padre[x])
-            return padre[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                padre[px] = py
-                return True
-            return False
+        conjuntos = UnionFind(len(salas))
+        unidas = conjuntos.union_lote([i for _, i, _ in aristas], [j for _, _, j in aristas],
+                                      max_uniones=len(salas) - 1)
 
         # Conectar salas
-        for dist, i, j in aristas:
-            if union(i, j):
+        for (dist, i, j), unida in zip(aristas, unidas):
+            if unida:
                 self._crear_pasillo(grid, centros[i], centros[j])
 
     def _crear_pasillo(self, grid, inicio, fin):
@@ -106,12 +98,12 @@ class GeneradorDungeon:
         # Pasillo horizontal
         for x in range(min(x1, x2), max(x1, x2) + 1):
             if 0 <= x < self.tamano and 0 <= y1 < self.tamano:
-                grid[x, y1] = 'LLANURA'
+                grid[x, y1] = TIPOS_TERRENO.LLANURA
 
         # Pasillo vertical
         for y in range(min(y1, y2), max(y1, y2) + 1):
             if 0 <= x2 < self.tamano and 0 <= y < self.tamano:
-                grid[x2, y] = 'LLANURA'
+                grid[x2, y] = TIPOS_TERRENO.LLANURA
 
     def _agregar_obstaculos_salas(self, grid, salas):
         """Agrega obstáculos dentro de las salas"""
@@ -122,4 +114,6 @@ class GeneradorDungeon:
                 for _ in range(random.randint(1, 3)):
                     ox = random.randint(x + 1, x + w - 2)
                     oy = random.randint(y + 1, y + h - 2)
-                    grid[ox, oy] = random.choice(['BOSQUE', 'PANTANO', 'AGUA'])
\ No newline at end of file
+                    grid[ox, oy] = random.choice([TIPOS_TERRENO.BOSQUE,
+                                                   TIPOS_TERRENO.PANTANO,
+                                                   TIPOS_TERRENO.AGUA])
\ No newline at end of file
@@ -1,6 +1,8 @@
 import numpy as np
 import random
 from heapq import heappush, heappop
+from modelos.terreno import TIPOS_TERRENO
+from algoritmos.union_find import UnionFind
 
 class GeneradorLaberinto:
     def __init__(self, tamano):
@@ -17,12 +19,12 @@ class GeneradorLaberinto:
         4. Resultado: ¡Un laberinto perfecto sin ciclos!
         """
         # Todo es pared inicialmente
-        grid = np.full((self.tamano, self.tamano), 'MONTAÑA', dtype=object)
+        grid = np.full((self.tamano, self.tamano), TIPOS_TERRENO.MONTAÑA, dtype=np.uint8)
 
         # Celda inicial aleatoria (debe ser impar para que funcione)
         inicio_x = random.randrange(1, self.tamano, 2)
         inicio_y = random.randrange(1, self.tamano, 2)
-        grid[inicio_x, inicio_y] = 'LLANURA'
+        grid[inicio_x, inicio_y] = TIPOS_TERRENO.LLANURA
 
         # Paredes candidatas (celdas que podemos "romper")
         paredes = []
@@ -36,13 +38,13 @@ class GeneradorLaberinto:
 
             # Verificar si podemos romper esta pared
             if self._puede_romper_pared(px, py, grid):
-                grid[px, py] = 'LLANURA'
+                grid[px, py] = TIPOS_TERRENO.LLANURA
 
                 # Encontrar la celda al otro lado
                 vecino = self._encontrar_celda_opuesta(px, py, grid)
                 if vecino:
                     nx, ny = vecino
-                    grid[nx, ny] = 'LLANURA'
+                    grid[nx, ny] = TIPOS_TERRENO.LLANURA
                     self._agregar_paredes(nx, ny, paredes, grid)
 
         # Agregar variedad de terrenos en los pasillos
@@ -60,7 +62,7 @@ class GeneradorLaberinto:
         3. Usa Union-Find para evitar ciclos
         4. Resultado: ¡Laberinto perfecto con caminos largos!
         """
-        grid = np.full((self.tamano, self.tamano), 'MONTAÑA', dtype=object)
+        grid = np.full((self.tamano, self.tamano), TIPOS_TERRENO.MONTAÑA, dtype=np.uint8)
 
         # Crear lista de todas las celdas (solo impares)
         celdas = [(i, j) for i in range(1, self.tamano, 2)
@@ -68,22 +70,7 @@ class GeneradorLaberinto:
 
         # Marcar todas las celdas como camino
         for x, y in celdas:
-            grid[x, y] = 'LLANURA'
-
-        # Union-Find
-        padre = {celda: celda for celda in celdas}
-
-        def find(x):
-            if padre[x] != x:
-                padre[x] = find(padre[x])
-            return padre[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                padre[px] = py
-                return True
-            return False
+            grid[x, y] = TIPOS_TERRENO.LLANURA
 
         # Crear lista de paredes entre celdas
         paredes = []
@@ -98,70 +85,14 @@ class GeneradorLaberinto:
         # Mezclar paredes aleatoriamente
         random.shuffle(paredes)
 
-        # Algoritmo de Kruskal
-        for celda1, celda2, pared in paredes:
-            if union(celda1, celda2):
-                # Romper la pared
-                grid[pared[0], pared[1]] = 'LLANURA'
-
-        # Agregar variedad
-        self._agregar_variedad_terreno(grid)
-
-        return grid
-
-    def generar_laberinto_kruskal(self):
-        """
-        Genera laberinto usando algoritmo de Kruskal
-
-        CÓMO FUNCIONA:
-        1. Cada celda empieza siendo su propio "set"
-        2. Aleatoriamente une sets rompiendo paredes
-        3. Usa Union-Find para evitar ciclos
-        4. Resultado: ¡Laberinto perfecto con caminos largos!
-        """
-        grid = np.full((self.tamano, self.tamano), 'MONTAÑA', dtype=object)
-
-        # Crear lista de todas las celdas (solo impares)
-        celdas = [(i, j) for i in range(1, self.tamano, 2)
-                  for j in range(1, self.tamano, 2)]
-
-        # Marcar todas las celdas como camino
-        for x, y in celdas:
-            grid[x, y] = 'LLANURA'
-
-        # Union-Find
-        padre = {celda: celda for celda in celdas}
-
-        def find(x):
-            if padre[x] != x:
-                padre[x] = find(padre[x])
-            return padre[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                padre[px] = py
-                return True
-            return False
-
-        # Crear lista de paredes entre celdas
-        paredes = []
-        for x, y in celdas:
-            # Pared derecha
-            if y + 2 < self.tamano:
-                paredes.append(((x, y), (x, y + 2), (x, y + 1)))
-            # Pared abajo
-            if x + 2 < self.tamano:
-                paredes.append(((x, y), (x + 2, y), (x + 1, y)))
-
-        # Mezclar paredes aleatoriamente
-        random.shuffle(paredes)
+        # Algoritmo de Kruskal con Union-Find sobre ids de celda (x * tamano + y)
+        conjuntos = UnionFind(self.tamano * self.tamano)
+        unidas = conjuntos.union_lote([x * self.tamano + y for (x, y), _, _ in paredes],
+                                      [x * self.tamano + y for _, (x, y), _ in paredes])
 
-        # Algoritmo de Kruskal
-        for celda1, celda2, pared in paredes:
-            if union(celda1, celda2):
-                # Romper la pared
-                grid[pared[0], pared[1]] = 'LLANURA'
+        # Romper las paredes que unieron dos sets
+        rotas = np.array([pared for _, _, pared in paredes], dtype=np.int64).reshape(-1, 2)[unidas]
+        grid[rotas[:, 0], rotas[:, 1]] = TIPOS_TERRENO.LLANURA
 
         # Agregar variedad
         self._agregar_variedad_terreno(grid)
@@ -173,7 +104,7 @@ class GeneradorLaberinto:
         for dx, dy in [(0, 2), (2, 0), (0, -2), (-2, 0)]:
             nx, ny = x + dx, y + dy
             if 0 <= nx < self.tamano and 0 <= ny < self.tamano:
-                if grid[nx, ny] == 'MONTAÑA':
+                if grid[nx, ny] == TIPOS_TERRENO.MONTAÑA:
                     # Agregar la pared entre (x,y) y (nx,ny)
                     pared_x, pared_y = x + dx // 2, y + dy // 2
                     if (pared_x, pared_y) not in paredes:
@@ -186,7 +117,7 @@ class GeneradorLaberinto:
         for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
             nx, ny = x + dx, y + dy
             if 0 <= nx < self.tamano and 0 <= ny < self.tamano:
-                if grid[nx, ny] == 'LLANURA':
+                if grid[nx, ny] == TIPOS_TERRENO.LLANURA:
                     celdas_camino += 1
 
         # Solo romper si conecta exactamente 1 camino con pared
@@ -197,7 +128,7 @@ class GeneradorLaberinto:
         for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
             nx, ny = px + dx, py + dy
             if 0 <= nx < self.tamano and 0 <= ny < self.tamano:
-                if grid[nx, ny] == 'MONTAÑA':
+                if grid[nx, ny] == TIPOS_TERRENO.MONTAÑA:
                     return (nx, ny)
         return None
 
@@ -205,12 +136,12 @@ class GeneradorLaberinto:
         """Agrega diferentes tipos de terreno en los pasillos"""
         for i in range(self.tamano):
             for j in range(self.tamano):
-                if grid[i, j] == 'LLANURA':
+                if grid[i, j] == TIPOS_TERRENO.LLANURA:
                     rand = random.random()
                     if rand < 0.15:
-                        grid[i, j] = 'BOSQUE'
+                        grid[i, j] = TIPOS_TERRENO.BOSQUE
                     elif rand < 0.25:
-                        grid[i, j] = 'PANTANO'
+                        grid[i, j] = TIPOS_TERRENO.PANTANO
                     elif rand < 0.28:
-                        grid[i, j] = 'AGUA'
+                        grid[i, j] = TIPOS_TERRENO.AGUA
 
@@ -6,6 +6,7 @@ Implementa Perlin Noise y Autómatas Celulares
 import numpy as np
 import random
 from noise import pnoise2
+from modelos.terreno import TIPOS_TERRENO
 
 
 class GeneradorMapa:
@@ -24,7 +25,7 @@ class GeneradorMapa:
         - persistencia: Cómo disminuye amplitud en cada octava
         - lacunaridad: Cómo aumenta frecuencia en cada octava
         """
-        mapa = np.empty((self.tamano, self.tamano), dtype=object)
+        mapa = np.empty((self.tamano, self.tamano), dtype=np.uint8)
 
         # Generar ruido Perlin
         escala = 10.0
@@ -47,15 +48,15 @@ class GeneradorMapa:
                 # Mapear ruido a tipos de terreno
                 # Valores bajos = agua, valores altos = montaña
                 if valor_ruido < -0.3:
-                    mapa[i, j] = 'AGUA'
+                    mapa[i, j] = TIPOS_TERRENO.AGUA
                 elif valor_ruido < -0.1:
-                    mapa[i, j] = 'PANTANO'
+                    mapa[i, j] = TIPOS_TERRENO.PANTANO
                 elif valor_ruido < 0.2:
-                    mapa[i, j] = 'LLANURA'
+                    mapa[i, j] = TIPOS_TERRENO.LLANURA
                 elif valor_ruido < 0.4:
-                    mapa[i, j] = 'BOSQUE'
+                    mapa[i, j] = TIPOS_TERRENO.BOSQUE
                 else:
-                    mapa[i, j] = 'MONTAÑA'
+                    mapa[i, j] = TIPOS_TERRENO.MONTAÑA
 
         return mapa
 
@@ -77,10 +78,10 @@ class GeneradorMapa:
         """
         # PASO 1: Inicialización aleatoria
         mapa = np.random.choice(
-            ['LLANURA', 'MONTAÑA'],
+            [TIPOS_TERRENO.LLANURA, TIPOS_TERRENO.MONTAÑA],
             size=(self.tamano, self.tamano),
             p=[1 - prob_pared_inicial, prob_pared_inicial]
-        )
+        ).astype(np.uint8)
 
         # PASO 2: Aplicar reglas de autómata celular
         for _ in range(iteraciones):
@@ -94,10 +95,10 @@ class GeneradorMapa:
                     # REGLA DEL AUTÓMATA:
                     # Muchos vecinos pared (5+) → esta celda se vuelve pared
                     if vecinos_pared >= 5:
-                        nuevo_mapa[i, j] = 'MONTAÑA'
+                        nuevo_mapa[i, j] = TIPOS_TERRENO.MONTAÑA
                     # Pocos vecinos pared (2-) → esta celda se vuelve suelo
                     elif vecinos_pared <= 2:
-                        nuevo_mapa[i, j] = 'LLANURA'
+                        nuevo_mapa[i, j] = TIPOS_TERRENO.LLANURA
                     # 3-4 vecinos → mantiene su estado
 
             mapa = nuevo_mapa
@@ -105,14 +106,14 @@ class GeneradorMapa:
         # PASO 3: Añadir variedad de terrenos en zonas de suelo
         for i in range(self.tamano):
             for j in range(self.tamano):
-                if mapa[i, j] == 'LLANURA':
+                if mapa[i, j] == TIPOS_TERRENO.LLANURA:
                     aleatorio = random.random()
                     if aleatorio < 0.2:
-                        mapa[i, j] = 'BOSQUE'
+                        mapa[i, j] = TIPOS_TERRENO.BOSQUE
                     elif aleatorio < 0.3:
-                        mapa[i, j] = 'PANTANO'
+                        mapa[i, j] = TIPOS_TERRENO.PANTANO
                     elif aleatorio < 0.35:
-                        mapa[i, j] = 'AGUA'
+                        mapa[i, j] = TIPOS_TERRENO.AGUA
 
         return mapa
 
@@ -138,7 +139,7 @@ class GeneradorMapa:
 
                 # Si está dentro del mapa
                 if 0 <= nx < self.tamano and 0 <= ny < self.tamano:
-                    if mapa[nx, ny] == 'MONTAÑA':
+                    if mapa[nx, ny] == TIPOS_TERRENO.MONTAÑA:
                         contador += 1
                 else:
                     # Bordes del mapa cuentan como pared
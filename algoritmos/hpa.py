@@ -0,0 +1,294 @@
+"""
+HPA* (Hierarchical Path-Finding A*) sobre el grid del mapa
+"""
+
+from heapq import heappush, heappop
+
+
+class HPAEstrella:
+    # ancho máximo de una entrada con un solo nodo; las más anchas usan dos (extremos)
+    MAX_ENTRADA = 6
+
+    def __init__(self, mapa_juego, tam_cluster=10):
+        """
+        Inicializa la jerarquía
+
+        Args:
+            mapa_juego: Referencia al mapa del juego
+            tam_cluster: Lado (en celdas) de cada cluster
+        """
+        self.mapa = mapa_juego
+        self.tam_cluster = tam_cluster
+        self.num_clusters = (mapa_juego.size + tam_cluster - 1) // tam_cluster
+        self.version = None  # versión del mapa con la que se construyó
+
+        # Grafo abstracto (los nodos son ids de celda x * size + y)
+        self.nodos_cluster = {}  # {cluster: set(nodos)}
+        self.inter = {}          # {nodo: {vecino: costo}} aristas entre clusters
+        self.intra = {}          # {cluster: {nodo: {vecino: costo}}} caminos dentro del cluster
+        self.entradas = {}       # {(cluster, 'derecha'|'abajo'): [(nodo_a, nodo_b)]}
+
+    def construir(self):
+        """Construye todas las entradas y las aristas internas de cada cluster"""
+        self.nodos_cluster = {}
+        self.inter = {}
+        self.intra = {}
+        self.entradas = {}
+        self.num_clusters = (self.mapa.size + self.tam_cluster - 1) // self.tam_cluster
+        self.version = self.mapa.version
+
+        clusters = [(cx, cy) for cx in range(self.num_clusters) for cy in range(self.num_clusters)]
+        for cluster in clusters:
+            self.nodos_cluster.setdefault(cluster, set())
+            for lado in ('derecha', 'abajo'):
+                self._crear_entradas(cluster, lado)
+
+        for cluster in clusters:
+            self._calcular_intra(cluster)
+
+        num_nodos = sum(len(n) for n in self.nodos_cluster.values())
+        print(f"🧭 HPA*: {len(clusters)} clusters, {num_nodos} nodos abstractos")
+
+    def actualizar(self, celdas):
+        """
+        Reconstruye solo los clusters afectados por cambios de terreno
+
+        Después queda al día con la versión actual del mapa, así que celdas
+        debe incluir todos los cambios hechos desde la última construcción.
+
+        Args:
+            celdas: Celdas (x, y) modificadas en el mapa
+        """
+        tocados = {self._cluster_de(x, y) for x, y in celdas}
+
+        # los bordes de un cluster tocado cambian sus entradas...
+        bordes = set()
+        for cx, cy in tocados:
+            bordes.update({((cx, cy), 'derecha'), ((cx, cy), 'abajo'),
+                           ((cx, cy - 1), 'derecha'), ((cx - 1, cy), 'abajo')})
+        bordes = {(c, lado) for c, lado in bordes if c in self.nodos_cluster}
+
+        # ...y con ellas los nodos de los clusters vecinos
+        recalcular = set()
+        for (cx, cy), lado in bordes:
+            recalcular.add((cx, cy))
+            recalcular.add((cx, cy + 1) if lado == 'derecha' else (cx + 1, cy))
+
+        for borde in bordes:
+            self._eliminar_entradas(*borde)
+        for borde in bordes:
+            self._crear_entradas(*borde)
+        for cluster in recalcular:
+            if cluster in self.nodos_cluster:
+                self._calcular_intra(cluster)
+        self.version = self.mapa.version
+
+        print(f"🧭 HPA*: {len(recalcular)} clusters reconstruidos")
+
+    def buscar(self, inicio, meta):
+        """
+        Busca un camino: primero en el grafo abstracto y luego lo refina localmente
+
+        El resultado es casi óptimo (las entradas limitan los cruces entre clusters).
+        Devuelve el mismo formato que Busquedas.a_estrella.
+        """
+        if self.version != self.mapa.version:
+            if self.version is not None:
+                print("⚠️ El mapa cambió, reconstruyendo HPA*...")
+            self.construir()
+
+        size = self.mapa.size
+        id_inicio = inicio[0] * size + inicio[1]
+        id_meta = meta[0] * size + meta[1]
+        cluster_inicio = self._cluster_de(*inicio)
+        cluster_meta = self._cluster_de(*meta)
+
+        # Conectar inicio y meta a los nodos de su cluster (aristas temporales)
+        temporales = {id_inicio: {}}
+        distancias, _ = self._dijkstra_local(id_inicio, cluster_inicio)
+        for nodo in self.nodos_cluster[cluster_inicio]:
+            if nodo in distancias:
+                temporales[id_inicio][nodo] = distancias[nodo]
+
+        distancias, _ = self._dijkstra_local(id_meta, cluster_meta, hacia_origen=True)
+        for nodo in self.nodos_cluster[cluster_meta]:
+            if nodo in distancias:
+                temporales.setdefault(nodo, {})[id_meta] = distancias[nodo]
+        if cluster_inicio == cluster_meta and id_inicio in distancias:
+            temporales[id_inicio][id_meta] = distancias[id_inicio]
+
+        # A* sobre el grafo abstracto
+        frontera = [(0, id_inicio)]
+        costo_hasta_ahora = {id_inicio: 0}
+        vino_de = {id_inicio: None}
+        cerrados = set()
+        orden_visitados = []
+
+        while frontera:
+            _, actual = heappop(frontera)
+            if actual in cerrados:
+                continue
+            cerrados.add(actual)
+            orden_visitados.append(divmod(actual, size))
+
+            if actual == id_meta:
+                break
+
+            for vecino, costo in self._vecinos_abstractos(actual, temporales):
+                if vecino in cerrados:
+                    continue
+                nuevo_costo = costo_hasta_ahora[actual] + costo
+                if nuevo_costo < costo_hasta_ahora.get(vecino, float('inf')):
+                    costo_hasta_ahora[vecino] = nuevo_costo
+                    vx, vy = divmod(vecino, size)
+                    prioridad = nuevo_costo + abs(vx - meta[0]) + abs(vy - meta[1])
+                    heappush(frontera, (prioridad, vecino))
+                    vino_de[vecino] = actual
+
+        if id_meta not in vino_de:
+            print(f"HPA* exploró {len(orden_visitados)} nodos abstractos")
+            return [], orden_visitados, [], float('inf')
+
+        abstracto = []
+        actual = id_meta
+        while actual is not None:
+            abstracto.append(actual)
+            actual = vino_de[actual]
+        abstracto.reverse()
+
+        camino = self._refinar(abstracto)
+        print(f"HPA* exploró {len(orden_visitados)} nodos abstractos")
+        return camino, orden_visitados, [], costo_hasta_ahora[id_meta]
+
+    def _vecinos_abstractos(self, nodo, temporales):
+        """Aristas salientes de un nodo abstracto (entre clusters, internas y temporales)"""
+        cluster = self._cluster_de(*divmod(nodo, self.mapa.size))
+        yield from self.inter.get(nodo, {}).items()
+        yield from self.intra.get(cluster, {}).get(nodo, {}).items()
+        yield from temporales.get(nodo, {}).items()
+
+    def _refinar(self, abstracto):
+        """Convierte el camino abstracto en celdas, con búsquedas locales dentro de cada cluster"""
+        size = self.mapa.size
+        camino = [divmod(abstracto[0], size)]
+        for desde, hasta in zip(abstracto, abstracto[1:]):
+            cluster = self._cluster_de(*divmod(desde, size))
+            if cluster != self._cluster_de(*divmod(hasta, size)):
+                # arista entre clusters: celdas adyacentes
+                camino.append(divmod(hasta, size))
+                continue
+
+            _, padres = self._dijkstra_local(desde, cluster, objetivo=hasta)
+            tramo = []
+            actual = hasta
+            while actual != desde:
+                tramo.append(divmod(actual, size))
+                actual = padres[actual]
+            camino.extend(reversed(tramo))
+        return camino
+
+    def _cluster_de(self, x, y):
+        return x // self.tam_cluster, y // self.tam_cluster
+
+    def _limites(self, cluster):
+        """Rango de filas y columnas [x0, x1) x [y0, y1) de un cluster"""
+        cx, cy = cluster
+        x0, y0 = cx * self.tam_cluster, cy * self.tam_cluster
+        return (x0, min(x0 + self.tam_cluster, self.mapa.size),
+                y0, min(y0 + self.tam_cluster, self.mapa.size))
+
+    def _crear_entradas(self, cluster, lado):
+        """Detecta los tramos libres del borde derecho/inferior de un cluster y crea sus nodos"""
+        cx, cy = cluster
+        vecino = (cx, cy + 1) if lado == 'derecha' else (cx + 1, cy)
+        if vecino[0] >= self.num_clusters or vecino[1] >= self.num_clusters:
+            return
+
+        x0, x1, y0, y1 = self._limites(cluster)
+        if lado == 'derecha':
+            pares = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+        else:
+            pares = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+
+        # tramos contiguos donde ambas celdas son transitables
+        tramos, tramo = [], []
+        for a, b in pares:
+            if self.mapa.obtener_costo(*a) != float('inf') and self.mapa.obtener_costo(*b) != float('inf'):
+                tramo.append((a, b))
+            elif tramo:
+                tramos.append(tramo)
+                tramo = []
+        if tramo:
+            tramos.append(tramo)
+
+        size = self.mapa.size
+        entradas = []
+        for tramo in tramos:
+            elegidos = [tramo[len(tramo) // 2]] if len(tramo) < self.MAX_ENTRADA else [tramo[0], tramo[-1]]
+            for a, b in elegidos:
+                id_a, id_b = a[0] * size + a[1], b[0] * size + b[1]
+                self.inter.setdefault(id_a, {})[id_b] = self.mapa.obtener_costo(*b)
+                self.inter.setdefault(id_b, {})[id_a] = self.mapa.obtener_costo(*a)
+                self.nodos_cluster.setdefault(cluster, set()).add(id_a)
+                self.nodos_cluster.setdefault(vecino, set()).add(id_b)
+                entradas.append((id_a, id_b))
+        self.entradas[(cluster, lado)] = entradas
+
+    def _eliminar_entradas(self, cluster, lado):
+        """Quita las entradas de un borde; los nodos sin otras entradas dejan de ser abstractos"""
+        cx, cy = cluster
+        vecino = (cx, cy + 1) if lado == 'derecha' else (cx + 1, cy)
+        for id_a, id_b in self.entradas.pop((cluster, lado), []):
+            self.inter[id_a].pop(id_b, None)
+            self.inter[id_b].pop(id_a, None)
+            for nodo, c in ((id_a, cluster), (id_b, vecino)):
+                if not self.inter[nodo]:
+                    del self.inter[nodo]
+                    self.nodos_cluster[c].discard(nodo)
+
+    def _calcular_intra(self, cluster):
+        """Costes entre todos los nodos abstractos de un cluster, sin salir de él"""
+        aristas = {}
+        nodos = self.nodos_cluster.get(cluster, set())
+        for nodo in nodos:
+            distancias, _ = self._dijkstra_local(nodo, cluster)
+            aristas[nodo] = {otro: distancias[otro] for otro in nodos
+                             if otro != nodo and otro in distancias}
+        self.intra[cluster] = aristas
+
+    def _dijkstra_local(self, origen, cluster, hacia_origen=False, objetivo=None):
+        """
+        Dijkstra restringido a las celdas de un cluster
+
+        Returns:
+            (distancias, padres) como dicts por id de celda. Con hacia_origen=True
+            las distancias son d(celda, origen) y padres apunta hacia el origen.
+        """
+        indptr, vecinos, costos = self.mapa.obtener_adyacencia().como_listas()
+        size = self.mapa.size
+        x0, x1, y0, y1 = self._limites(cluster)
+
+        distancias = {origen: 0}
+        padres = {origen: None}
+        frontera = [(0, origen)]
+        while frontera:
+            distancia, actual = heappop(frontera)
+            if distancia > distancias[actual]:
+                continue
+            if actual == objetivo:
+                break
+
+            costo_atras = self.mapa.obtener_costo(*divmod(actual, size)) if hacia_origen else 0
+            for k in range(indptr[actual], indptr[actual + 1]):
+                siguiente = vecinos[k]
+                sx, sy = divmod(siguiente, size)
+                if not (x0 <= sx < x1 and y0 <= sy < y1):
+                    continue
+
+                nueva = distancia + (costo_atras if hacia_origen else costos[k])
+                if nueva < distancias.get(siguiente, float('inf')):
+                    distancias[siguiente] = nueva
+                    padres[siguiente] = actual
+                    heappush(frontera, (nueva, siguiente))
+
+        return distancias, padres
@@ -0,0 +1,117 @@
+"""
+Índice espacial de cubetas uniformes sobre celdas del grid
+"""
+
+import numpy as np
+
+
+class IndiceEspacial:
+    def __init__(self, puntos, tam_celda):
+        """
+        Reparte los puntos en cubetas cuadradas de tam_celda x tam_celda
+
+        Las cubetas forman un CSR: los puntos de la cubeta c son
+        orden[indptr[c]:indptr[c + 1]] (índices en puntos). Las distancias
+        son Manhattan, como en el resto del grid.
+
+        Args:
+            puntos: Secuencia de celdas (x, y) o arreglo (N, 2)
+            tam_celda: Lado de cada cubeta (conviene que sea el radio de consulta)
+        """
+        self.puntos = np.asarray(puntos, dtype=np.int64).reshape(-1, 2)
+        self.tam_celda = max(1, int(tam_celda))
+        self.cubetas = self.puntos // self.tam_celda
+        self.ancho = int(self.cubetas.max()) + 1 if len(self.puntos) else 1  # cubetas por lado
+
+        ids = self.cubetas[:, 0] * self.ancho + self.cubetas[:, 1]
+        self.orden = np.argsort(ids, kind='stable')
+        self.indptr = np.zeros(self.ancho * self.ancho + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ids, minlength=self.ancho * self.ancho), out=self.indptr[1:])
+
+    def pares_en_radio(self, radio, filas=None):
+        """
+        Todos los pares (i, j) con i < j a distancia <= radio
+
+        Cada punto solo se compara con los de las cubetas vecinas que pueden
+        estar dentro del radio, todos los puntos a la vez por desplazamiento.
+
+        Args:
+            radio: Distancia máxima
+            filas: (inicio, fin) opcional: solo los pares cuyo punto i está en
+                   esas filas de cubetas (para repartir el trabajo por zonas)
+
+        Returns:
+            Arreglo (P, 2) de índices en puntos, ordenado por (i, j)
+        """
+        alcance = -(-int(radio) // self.tam_celda)  # cubetas a revisar a cada lado
+        todos = np.arange(len(self.puntos))
+        if filas is not None:
+            todos = todos[(self.cubetas[:, 0] >= filas[0]) & (self.cubetas[:, 0] < filas[1])]
+        cubetas = self.cubetas[todos]
+        pares = []
+
+        for dx in range(-alcance, alcance + 1):
+            for dy in range(-alcance, alcance + 1):
+                cx = cubetas[:, 0] + dx
+                cy = cubetas[:, 1] + dy
+                dentro = (cx >= 0) & (cx < self.ancho) & (cy >= 0) & (cy < self.ancho)
+                i, j = self._candidatos(todos[dentro], cx[dentro] * self.ancho + cy[dentro])
+
+                distancia = np.abs(self.puntos[i] - self.puntos[j]).sum(axis=1)
+                cerca = (i < j) & (distancia <= radio)
+                pares.append(np.stack([i[cerca], j[cerca]], axis=1))
+
+        pares = np.concatenate(pares) if pares else np.zeros((0, 2), dtype=np.int64)
+        return pares[np.lexsort((pares[:, 1], pares[:, 0]))]
+
+    def k_cercanos(self, punto, k):
+        """
+        Los k puntos más cercanos a punto, de menor a mayor distancia (empates por (x, y))
+
+        Agranda un cuadrado de cubetas alrededor del punto hasta que el k-ésimo
+        candidato está más cerca que cualquier punto de fuera del cuadrado.
+
+        Returns:
+            (distancias, indices): arreglos de largo min(k, N)
+        """
+        if k <= 0 or not len(self.puntos):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        x, y = punto
+        cx, cy = x // self.tam_celda, y // self.tam_celda
+        radio = 0
+
+        while True:
+            candidatos = self._en_cuadrado(cx, cy, radio)
+            distancias = np.abs(self.puntos[candidatos] - (x, y)).sum(axis=1)
+            cubre_todo = (cx - radio <= 0 and cy - radio <= 0 and
+                          cx + radio >= self.ancho - 1 and cy + radio >= self.ancho - 1)
+
+            # fuera del cuadrado la distancia es al menos radio * tam_celda + 1
+            if cubre_todo or (len(candidatos) >= k and
+                              np.partition(distancias, k - 1)[k - 1] <= radio * self.tam_celda):
+                break
+            radio = radio * 2 + 1
+
+        puntos = self.puntos[candidatos]
+        orden = np.lexsort((puntos[:, 1], puntos[:, 0], distancias))[:k]
+        return distancias[orden], candidatos[orden]
+
+    def _en_cuadrado(self, cx, cy, radio):
+        """Índices de los puntos en las cubetas a distancia (Chebyshev) <= radio de (cx, cy)"""
+        y0 = max(0, cy - radio)
+        y1 = min(self.ancho, cy + radio + 1)
+        if y0 >= y1:
+            return np.zeros(0, dtype=np.int64)
+
+        # en cada fila de cubetas, las columnas y0..y1 son un tramo contiguo del CSR
+        tramos = [self.orden[self.indptr[fila * self.ancho + y0]:self.indptr[fila * self.ancho + y1]]
+                  for fila in range(max(0, cx - radio), min(self.ancho, cx + radio + 1))]
+        return np.concatenate(tramos) if tramos else np.zeros(0, dtype=np.int64)
+
+    def _candidatos(self, indices, cubetas):
+        """Pares (i, j): cada indices[k] con todos los puntos de cubetas[k]"""
+        comienzo = self.indptr[cubetas]
+        cuantos = self.indptr[cubetas + 1] - comienzo
+        locales = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        return np.repeat(indices, cuantos), self.orden[np.repeat(comienzo, cuantos) + locales]
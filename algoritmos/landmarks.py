@@ -0,0 +1,102 @@
+"""
+Heurística ALT (A*, Landmarks, desigualdad Triangular)
+"""
+
+import numpy as np
+from algoritmos.busquedas import Busquedas
+from algoritmos.busqueda_en_curso import agotar
+
+
+class Landmarks:
+    def __init__(self, mapa_juego, cantidad=8):
+        """
+        Elige landmarks y precalcula sus distancias exactas a todo el mapa
+
+        El primero es la primera celda libre del grid; cada siguiente es la
+        celda libre más lejana a los ya elegidos (o una de otra región
+        desconectada, si queda alguna sin cubrir).
+
+        Args:
+            mapa_juego: Referencia al mapa del juego
+            cantidad: Número de landmarks (K)
+        """
+        agotar(self._construir(mapa_juego, cantidad))
+
+    @classmethod
+    def pasos(cls, mapa_juego, cantidad=8):
+        """Como Landmarks(mapa_juego, cantidad) pero cediendo el control durante los Dijkstra"""
+        landmarks = cls.__new__(cls)
+        yield from landmarks._construir(mapa_juego, cantidad)
+        return landmarks
+
+    def _construir(self, mapa_juego, cantidad):
+        """Generador de la construcción (un Dijkstra completo por landmark)"""
+        self.mapa = mapa_juego
+        self.cantidad = cantidad
+        self.size = mapa_juego.size
+        self.costos = mapa_juego.obtener_costos().ravel()
+        libres = ~mapa_juego.obtener_obstaculos().ravel()
+
+        buscador = Busquedas(mapa_juego)
+        self.puntos = []
+        filas = []
+
+        if libres.any():
+            candidato = int(np.argmax(libres))
+            mas_cercana = np.full(self.size * self.size, np.inf)
+            for _ in range(cantidad):
+                self.puntos.append(candidato)
+                distancias, _ = yield from buscador.dijkstra_completo_pasos([divmod(candidato, self.size)])
+                filas.append(distancias)
+
+                mas_cercana = np.minimum(mas_cercana, distancias)
+                lejania = np.where(libres, mas_cercana, -1)
+                lejania[self.puntos] = -1
+                if lejania.max() <= 0:
+                    break
+                candidato = int(np.argmax(lejania))
+
+        # distancias[i, v] = d(landmark_i, v)
+        self.distancias = np.array(filas).reshape(len(filas), self.size * self.size)
+        # las mismas tablas en listas, para consultar nodo a nodo sin pasar por NumPy
+        self._filas = [fila.tolist() for fila in self.distancias]
+        self._costos = self.costos.tolist()
+
+    def cota_hacia(self, meta):
+        """
+        Heurística ALT hacia meta: función id -> cota inferior de d(v, meta)
+
+        Entrar a una celda cuesta su terreno, así que para el mismo camino
+        d(v, L) = d(L, v) - costo(v) + costo(L). Con eso cada landmark L da
+            d(v, meta) >= d(L, meta) - d(L, v)
+            d(v, meta) >= d(v, L) - d(meta, L) = d(L, v) - d(L, meta) - costo(v) + costo(meta)
+        La cota es el máximo entre estas y la distancia Manhattan; es
+        admisible y consistente. Solo se calcula para los nodos que la
+        búsqueda genera (K consultas por nodo): d(L, meta) queda fijo por
+        consulta. Los landmarks que no alcanzan la meta no aportan nada para
+        las celdas de su región, así que se descartan.
+        """
+        size = self.size
+        meta_x, meta_y = meta
+        id_meta = meta_x * size + meta_y
+        costo_meta = self._costos[id_meta]
+        costos = self._costos
+        infinito = float('inf')
+
+        # (d(L, ·), d(L, meta), costo(meta) - d(L, meta)) de cada landmark útil
+        utiles = [(fila, fila[id_meta], costo_meta - fila[id_meta])
+                  for fila in self._filas if fila[id_meta] != infinito]
+
+        def cota(nodo):
+            x, y = divmod(nodo, size)
+            mejor = abs(x - meta_x) + abs(y - meta_y)
+            costo_nodo = costos[nodo]
+            for fila, a_meta, resto in utiles:
+                desde_landmark = fila[nodo]
+                if a_meta - desde_landmark > mejor:
+                    mejor = a_meta - desde_landmark
+                if desde_landmark + resto - costo_nodo > mejor:
+                    mejor = desde_landmark + resto - costo_nodo
+            return mejor
+
+        return cota
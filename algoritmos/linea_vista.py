@@ -0,0 +1,125 @@
+"""
+Línea de vista entre celdas: muchos segmentos a la vez contra la máscara de montañas
+"""
+
+import numpy as np
+
+
+class LineaVista:
+    # resultados guardados como mucho (se vacía al pasarse)
+    MAX_ENTRADAS = 1 << 20
+
+    def __init__(self, bloqueado):
+        """
+        Comprobador sobre la máscara (size, size) de celdas bloqueadas
+
+        Un segmento entre los centros de dos celdas está libre si ninguna de
+        las celdas que toca (su supercover, esquinas incluidas) es montaña.
+        Es exacto, sin muestrear, y simétrico: libre(a, b) == libre(b, a).
+        Los resultados se guardan por par; el objeto vive lo que una versión
+        del mapa (MapaJuego.obtener_linea_vista).
+
+        Args:
+            bloqueado: Máscara bool (MapaJuego.obtener_obstaculos()); no se
+                       copia, así que puede estar en memoria compartida
+        """
+        self.size = bloqueado.shape[0]
+        self.bloqueado = bloqueado.reshape(-1)
+        self._cache = {}  # {id_menor * n + id_mayor: libre}
+
+    def libre(self, p1, p2):
+        """True si no hay montañas entre las celdas p1 y p2"""
+        return bool(self.libres([p1], [p2])[0])
+
+    def libres(self, origenes, destinos):
+        """
+        Revisa muchos segmentos en una pasada
+
+        Args:
+            origenes, destinos: Secuencias de celdas (x, y) o arreglos (E, 2)
+
+        Returns:
+            Arreglo bool (E,): True donde el segmento está libre
+        """
+        origenes = np.asarray(origenes, dtype=np.int64).reshape(-1, 2)
+        destinos = np.asarray(destinos, dtype=np.int64).reshape(-1, 2)
+        n = self.size * self.size
+
+        dentro = (((origenes >= 0) & (origenes < self.size)).all(axis=1) &
+                  ((destinos >= 0) & (destinos < self.size)).all(axis=1))
+        a = origenes[:, 0] * self.size + origenes[:, 1]
+        b = destinos[:, 0] * self.size + destinos[:, 1]
+        claves = np.where(dentro, np.minimum(a, b) * n + np.maximum(a, b), -1).tolist()
+
+        resultado = np.zeros(len(claves), dtype=bool)
+        faltan = []
+        for k, clave in enumerate(claves):
+            if clave < 0:
+                continue  # fuera del mapa: nunca libre
+            guardado = self._cache.get(clave)
+            if guardado is None:
+                faltan.append(k)
+            else:
+                resultado[k] = guardado
+
+        if faltan:
+            faltan = np.array(faltan)
+            libres = self.comprobar(origenes[faltan], destinos[faltan])
+            resultado[faltan] = libres
+            if len(self._cache) + len(faltan) > self.MAX_ENTRADAS:
+                self._cache.clear()
+            self._cache.update(zip([claves[k] for k in faltan.tolist()], libres.tolist()))
+        return resultado
+
+    def comprobar(self, origenes, destinos):
+        """Como libres pero sin caché (para los trabajadores de la construcción en paralelo)"""
+        origenes = np.asarray(origenes, dtype=np.int64).reshape(-1, 2)
+        destinos = np.asarray(destinos, dtype=np.int64).reshape(-1, 2)
+        dentro = (((origenes >= 0) & (origenes < self.size)).all(axis=1) &
+                  ((destinos >= 0) & (destinos < self.size)).all(axis=1))
+
+        libres = np.zeros(len(origenes), dtype=bool)
+        origenes, destinos = origenes[dentro], destinos[dentro]
+        libres[dentro] = ~(self._cruza_obstaculo(origenes, destinos, True) |
+                           self._cruza_obstaculo(origenes, destinos, False))
+        return libres
+
+    def _cruza_obstaculo(self, origenes, destinos, x_primero):
+        """
+        True donde el camino de celdas 4-conexo del segmento pisa una montaña
+
+        El segmento cruza nx = |dx| bordes verticales y ny = |dy| horizontales;
+        el k-ésimo borde en x se cruza en t = (2k + 1) / (2 nx) y el m-ésimo en
+        y en t = (2m + 1) / (2 ny). Mezclando ambos órdenes con aritmética
+        entera sale, sin bucles, en qué paso avanza cada eje. Cuando el segmento
+        pasa justo por una esquina hay empate: x_primero elige qué celda
+        intermedia se visita, y llamando con ambos valores se cubren las dos.
+        """
+        dx = destinos[:, 0] - origenes[:, 0]
+        dy = destinos[:, 1] - origenes[:, 1]
+        nx, ny = np.abs(dx), np.abs(dy)
+        pasos = nx + ny
+        total = int(pasos.sum())
+
+        # paso global de cada borde en x: k + (bordes en y cruzados antes)
+        arista_x = np.repeat(np.arange(len(nx)), nx)
+        k = np.arange(len(arista_x)) - np.repeat(np.cumsum(nx) - nx, nx)
+        nx_k, ny_k = nx[arista_x], ny[arista_x]
+        tiempo = (2 * k + 1) * ny_k
+        antes = (tiempo + nx_k - 1) // (2 * nx_k) if x_primero else (tiempo + nx_k) // (2 * nx_k)
+        comienzo = np.cumsum(pasos) - pasos
+        avanza_x = np.zeros(total, dtype=bool)
+        avanza_x[comienzo[arista_x] + k + np.minimum(antes, ny_k)] = True
+
+        # celdas después de cada paso: origen + avances acumulados dentro de su arista
+        arista = np.repeat(np.arange(len(pasos)), pasos)
+        avances_x = np.cumsum(avanza_x)
+        avances_y = np.arange(1, total + 1) - avances_x
+        previos_x = np.concatenate([[0], avances_x])[comienzo]
+        previos_y = comienzo - previos_x
+        x = origenes[arista, 0] + np.sign(dx)[arista] * (avances_x - previos_x[arista])
+        y = origenes[arista, 1] + np.sign(dy)[arista] * (avances_y - previos_y[arista])
+
+        cruza = self.bloqueado[origenes[:, 0] * self.size + origenes[:, 1]].copy()
+        cruza[arista[self.bloqueado[x * self.size + y]]] = True
+        return cruza
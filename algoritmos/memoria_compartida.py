@@ -0,0 +1,45 @@
+"""
+Arreglos NumPy en memoria compartida para los trabajadores de un ProcessPoolExecutor
+"""
+
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import numpy as np
+
+# arreglos compartidos vistos desde cada proceso {nombre: ndarray}
+compartido = {}
+
+
+def conectar(descripciones):
+    """Inicializador del trabajador: abre los bloques de memoria compartida"""
+    for nombre, (bloque, forma, tipo) in descripciones.items():
+        memoria = shared_memory.SharedMemory(name=bloque)
+        compartido[nombre] = np.ndarray(forma, dtype=tipo, buffer=memoria.buf)
+        compartido['_memoria_' + nombre] = memoria  # que no se cierre
+
+
+@contextmanager
+def compartir(arreglos):
+    """
+    Copia los arreglos {nombre: ndarray} a bloques de memoria compartida
+
+    Entrega (copias, descripciones): copias son los mismos arreglos vistos
+    desde este proceso y descripciones va en initargs de conectar. Al salir
+    los bloques se cierran y se liberan.
+    """
+    bloques = []
+    try:
+        copias = {}
+        descripciones = {}
+        for nombre, arreglo in arreglos.items():
+            bloque = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+            bloques.append(bloque)
+            copia = np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=bloque.buf)
+            copia[:] = arreglo
+            copias[nombre] = copia
+            descripciones[nombre] = (bloque.name, arreglo.shape, arreglo.dtype.str)
+        yield copias, descripciones
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
@@ -1,9 +1,13 @@
 import random
-from heapq import heappush, heappop
+import numpy as np
+from modelos.terreno import TIPOS_TERRENO
+from algoritmos.colas import nueva_cola
+from algoritmos.indice_espacial import IndiceEspacial
+from algoritmos.prm_paralelo import RoadmapParalelo
 
 
 class PRM:
-    def __init__(self, mapa_juego, num_samples=100, radio_conexion=5):
+    def __init__(self, mapa_juego, num_samples=100, radio_conexion=5, perezoso=False, procesos=1):
         """
         Inicializa PRM
 
@@ -11,14 +15,38 @@ class PRM:
             mapa_juego: Referencia al mapa del juego
             num_samples: Número de puntos aleatorios a generar
             radio_conexion: Radio máximo para conectar puntos
+            perezoso: Lazy PRM: conectar los vecinos sin revisar obstáculos y
+                      comprobar solo las aristas de cada camino candidato
+            procesos: Procesos para conectar el roadmap (1 = en este proceso,
+                      None = todos los núcleos)
         """
         self.mapa = mapa_juego
         self.num_samples = num_samples
         self.radio_conexion = radio_conexion
+        self.perezoso = perezoso
+        self.procesos = procesos
 
         # Grafo de roadmap (waypoints y sus conexiones)
         self.waypoints = []  # Lista de puntos (x, y)
-        self.conexiones = {}  # {punto: [puntos_conectados]}
+        self.version = None  # versión del mapa con la que se construyó
+        self._vaciar_grafo()
+
+    def _vaciar_grafo(self):
+        """
+        Roadmap en formato CSR: el nodo k es la celda nodos[k] y sus vecinos son
+        vecinos[indptr[k]:indptr[k + 1]], con el coste de cada arista en costos
+        """
+        self.nodos = np.zeros((0, 2), dtype=np.int64)  # waypoints sin repetir
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.vecinos = np.zeros(0, dtype=np.int64)
+        self.costos = np.zeros(0, dtype=np.int64)
+        self.pares = np.zeros((0, 2), dtype=np.int64)  # cada arista una vez, i < j
+        self.arista_csr = np.zeros(0, dtype=np.int64)  # índice en pares de cada posición del CSR
+        self.estado = np.zeros(0, dtype=np.int8)  # por arista: 1 libre, 0 sin comprobar, -1 bloqueada
+        self._estado = []
+        self.indice = None  # IndiceEspacial sobre los nodos
+        self._ids = {}  # {punto: id de nodo}
+        self._listas = ([0], [], [], [], [])  # (indptr, vecinos, costos, puntos, arista_csr) en listas
 
     def generar_roadmap(self):
         """
@@ -40,7 +68,7 @@ class PRM:
             y = random.randint(0, self.mapa.size - 1)
 
             # Solo agregar si NO es montaña
-            if self.mapa.grid[x, y] != 'MONTAÑA':
+            if self.mapa.grid[x, y] != TIPOS_TERRENO.MONTAÑA:
                 self.waypoints.append((x, y))
 
             intentos += 1
@@ -48,66 +76,139 @@ class PRM:
         print(f"   ✓ Generados {len(self.waypoints)} waypoints válidos")
 
         # PASO 2: Conectar puntos cercanos
-        self.conexiones = {punto: [] for punto in self.waypoints}
+        self._vaciar_grafo()
+        self._ids = {punto: k for k, punto in enumerate(dict.fromkeys(self.waypoints))}
+        self.nodos = np.array(list(self._ids), dtype=np.int64).reshape(-1, 2)
+        self.indice = IndiceEspacial(self.nodos, self.radio_conexion)
 
         print(f"   → Conectando waypoints...")
-        conexiones_hechas = 0
 
-        for i, punto1 in enumerate(self.waypoints):
-            for j, punto2 in enumerate(self.waypoints):
-                if i >= j:  # Evitar duplicados
-                    continue
+        # en modo perezoso se conectan todos; los obstáculos se revisan al consultar
+        if self.procesos != 1:
+            # franjas del mapa repartidas entre procesos, cada uno busca y comprueba sus pares
+            pares = RoadmapParalelo(self.nodos, self.mapa.obtener_obstaculos(), self.radio_conexion,
+                                    self.procesos).conectar(comprobar=not self.perezoso)
+        else:
+            # solo los pares dentro del radio (el índice evita comparar todos con todos)
+            pares = self.indice.pares_en_radio(self.radio_conexion)
+            if not self.perezoso:
+                # todos los pares contra las montañas en una sola pasada
+                extremos = self.nodos[pares]
+                pares = pares[self.mapa.obtener_linea_vista().libres(extremos[:, 0], extremos[:, 1])]
+
+        self._armar_csr(pares, np.full(len(pares), 0 if self.perezoso else 1, dtype=np.int8))
+        self.version = self.mapa.version
+
+        print(f"   ✓ Creadas {len(self.pares)} conexiones" +
+              (" (sin comprobar obstáculos)" if self.perezoso else ""))
 
-                # Calcular distancia
-                dist = self._distancia(punto1, punto2)
+        return self.waypoints, self.conexiones
 
-                # Si están cerca Y no hay obstáculos entre ellos
-                if dist <= self.radio_conexion and self._camino_libre(punto1, punto2):
-                    self.conexiones[punto1].append(punto2)
-                    self.conexiones[punto2].append(punto1)
-                    conexiones_hechas += 1
+    def _armar_csr(self, pares, estado):
+        """Arma el CSR (las dos direcciones de cada arista) a partir de los pares i < j"""
+        self.pares = pares
+        self.estado = estado
+        self._estado = estado.tolist()
+        origen = np.concatenate([pares[:, 0], pares[:, 1]])
+        destino = np.concatenate([pares[:, 1], pares[:, 0]])
+        orden = np.argsort(origen, kind='stable')
+        self.arista_csr = np.tile(np.arange(len(pares)), 2)[orden]
+
+        self.indptr = np.zeros(len(self.nodos) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origen, minlength=len(self.nodos)), out=self.indptr[1:])
+        self.vecinos = destino[orden]
+        self.costos = np.abs(self.nodos[origen[orden]] - self.nodos[self.vecinos]).sum(axis=1)
+
+        # las consultas recorren listas de Python (más rápido que indexar NumPy de a uno)
+        self._listas = (self.indptr.tolist(), self.vecinos.tolist(), self.costos.tolist(),
+                        [tuple(p) for p in self.nodos.tolist()], self.arista_csr.tolist())
+
+    @property
+    def conexiones(self):
+        """{punto: [puntos_conectados]} armado desde el CSR (solo para consultar)"""
+        indptr, vecinos, _, puntos, arista_csr = self._listas
+        estado = self._estado
+        return {punto: [puntos[vecinos[k]] for k in range(indptr[n], indptr[n + 1])
+                        if estado[arista_csr[k]] >= 0]
+                for n, punto in enumerate(puntos)}
+
+    def aristas(self):
+        """Aristas del roadmap sin repetir (menos las bloqueadas), como pares de celdas"""
+        puntos = self._listas[3]
+        return [(puntos[i], puntos[j]) for i, j in self.pares[self.estado >= 0].tolist()]
+
+    def _validar_aristas(self, aristas):
+        """
+        Lazy PRM: revisa las aristas sin comprobar de un camino candidato
 
-        print(f"   ✓ Creadas {conexiones_hechas} conexiones")
+        Returns:
+            True si alguna resultó bloqueada (hay que replanificar)
+        """
+        pendientes = np.array([a for a in aristas if self._estado[a] == 0], dtype=np.int64)
+        if not len(pendientes):
+            return False
 
-        return self.waypoints, self.conexiones
+        extremos = self.nodos[self.pares[pendientes]]
+        libres = self.mapa.obtener_linea_vista().libres(extremos[:, 0], extremos[:, 1])
+        self.estado[pendientes] = np.where(libres, 1, -1)
+        for arista, libre in zip(pendientes.tolist(), libres.tolist()):
+            self._estado[arista] = 1 if libre else -1
+        return not libres.all()
 
     def encontrar_camino(self, inicio, meta):
         """
         PASO 2: Encuentra camino usando el roadmap
 
         Proceso:
-        1. Conecta inicio y meta al roadmap
+        1. Conecta inicio y meta al roadmap con aristas temporales
         2. Usa A* sobre el roadmap (más rápido que grid completo)
         3. Retorna camino encontrado
+
+        El roadmap no se copia ni se modifica, así que sirve para muchas
+        consultas mientras el mapa no cambie (si cambió, se vuelve a generar).
         """
         if not self.waypoints:
             print("⚠️ Primero debes generar el roadmap!")
             return [], [], [], float('inf')
 
+        if not self.mapa.mismo_componente(inicio, meta):
+            print("❌ Inicio y meta están en regiones distintas, no hay camino")
+            return [], [], [], float('inf')
+
+        if self.version != self.mapa.version:
+            print("⚠️ El mapa cambió, regenerando el roadmap...")
+            self.generar_roadmap()
+
         print(f"🔍 Buscando camino de {inicio} a {meta}...")
 
-        # Crear una copia de las conexiones para no modificar el roadmap original
-        conexiones_temporales = {k: list(v) for k, v in self.conexiones.items()}
+        # Aristas temporales de esta consulta: {id: [(id_vecino, costo)]}
+        temporales = {}
+        extra = {}
 
         # PASO 1: Conectar inicio y meta al roadmap
         print(f"   → Conectando inicio {inicio}...")
-        inicio_conectado = self._conectar_punto_roadmap(inicio, conexiones_temporales)
+        id_inicio = self._conectar_punto_roadmap(inicio, temporales, extra)
 
         print(f"   → Conectando meta {meta}...")
-        meta_conectada = self._conectar_punto_roadmap(meta, conexiones_temporales)
+        id_meta = self._conectar_punto_roadmap(meta, temporales, extra)
 
-        if not inicio_conectado:
+        if id_inicio is None:
             print("❌ No se pudo conectar INICIO al roadmap")
             return [], [], [], float('inf')
 
-        if not meta_conectada:
+        if id_meta is None:
             print("❌ No se pudo conectar META al roadmap")
             return [], [], [], float('inf')
 
 
-        # PASO 2: A* sobre el roadmap
+        # PASO 2: A* sobre el roadmap (en modo perezoso se revisan solo las
+        # aristas del camino y se replanifica sin las bloqueadas)
         print(f"   → Ejecutando A* sobre roadmap...")
-        camino_waypoints = self._a_estrella_roadmap(inicio, meta, conexiones_temporales)
+        camino_waypoints, aristas_usadas = self._a_estrella_roadmap(id_inicio, id_meta, temporales, extra)
+        while self.perezoso and self._validar_aristas(aristas_usadas):
+            print(f"   ↻ Aristas bloqueadas en el camino, replanificando...")
+            camino_waypoints, aristas_usadas = self._a_estrella_roadmap(id_inicio, id_meta,
+                                                                         temporales, extra)
 
         if not camino_waypoints:
             print("❌ No se encontró camino entre inicio y meta")
@@ -126,39 +227,48 @@ class PRM:
 
         return camino_waypoints, visitados, frontera, costo_total
 
-    def _conectar_punto_roadmap(self, punto, conexiones):
+    def _conectar_punto_roadmap(self, punto, temporales, extra):
         """
         Conecta un punto al roadmap buscando el waypoint más cercano accesible
         OPTIMIZADO: Solo revisa los K waypoints más cercanos
+
+        El punto recibe un id nuevo (después de los nodos) guardado en
+        temporales {punto: id} y sus aristas van a extra, en ambos sentidos.
+
+        Returns:
+            Id del punto en el grafo, o None si no se pudo conectar
         """
-        # Si el punto ya existe en el roadmap, ya está conectado
-        if punto in conexiones:
+        # Si el punto ya existe en el roadmap (o en esta consulta), ya está conectado
+        nodo = self._ids.get(punto, temporales.get(punto))
+        if nodo is not None:
             print(f"   ✓ Punto {punto} ya existe en roadmap")
-            return True
+            return nodo
 
         # Verificar que el punto no sea montaña
         x, y = punto
         if not (0 <= x < self.mapa.size and 0 <= y < self.mapa.size):
             print(f"   ❌ Punto {punto} fuera del mapa")
-            return False
-        if self.mapa.grid[x, y] == 'MONTAÑA':
+            return None
+        if self.mapa.grid[x, y] == TIPOS_TERRENO.MONTAÑA:
             print(f"   ❌ Punto {punto} es montaña")
-            return False
+            return None
 
-        # PASO 1: Calcular distancias a TODOS los waypoints (rápido)
-        distancias = [(self._distancia(punto, w), w) for w in self.waypoints if w != punto]
-        distancias.sort()  # Ordenar por distancia
+        # PASO 1: Los 20 waypoints más cercanos, ordenados por distancia (índice espacial)
+        cercanos, indices = self.indice.k_cercanos(punto, 20)
+        distancias = list(zip(cercanos.tolist(), indices.tolist()))
+        libres = self.mapa.obtener_linea_vista().libres([punto] * len(indices),
+                                                        self.nodos[indices]).tolist()
 
-        # PASO 2: Solo revisar los 20 MÁS CERCANOS (en vez de los 150)
+        # PASO 2: Solo revisar esos 20 (en vez de todos)
         mejores_vecinos = []
-        max_revisar = min(20, len(distancias))  # Máximo 20 o menos si hay pocos waypoints
+        max_revisar = len(distancias)  # Máximo 20 o menos si hay pocos waypoints
 
         for i in range(max_revisar):
             dist, waypoint = distancias[i]
 
             # Si está dentro del radio Y el camino está libre
             if dist <= self.radio_conexion * 3:
-                if self._camino_libre(punto, waypoint):
+                if libres[i]:
                     mejores_vecinos.append((dist, waypoint))
                     # Si ya encontramos 3 buenos, no buscar más
                     if len(mejores_vecinos) >= 3:
@@ -169,78 +279,98 @@ class PRM:
             print(f"   ⚠️ Punto {punto} lejos, buscando más cercanos...")
             for i in range(min(10, len(distancias))):
                 dist, waypoint = distancias[i]
-                if self._camino_libre(punto, waypoint):
+                if libres[i]:
                     mejores_vecinos.append((dist, waypoint))
                     break  # Con uno es suficiente
 
-        # PASO 4: Conectar
+        # PASO 4: Conectar con aristas temporales
         if mejores_vecinos:
-            vecinos_seleccionados = [w for _, w in mejores_vecinos[:3]]
-
-            # Agregar temporalmente al roadmap
-            conexiones[punto] = vecinos_seleccionados
-            for vecino in vecinos_seleccionados:
-                if vecino not in conexiones:
-                    conexiones[vecino] = []
-                if punto not in conexiones[vecino]:  # Evitar duplicados
-                    conexiones[vecino].append(punto)
+            nodo = temporales[punto] = len(self.nodos) + len(temporales)
+            for dist, vecino in mejores_vecinos[:3]:
+                extra.setdefault(nodo, []).append((vecino, dist))
+                extra.setdefault(vecino, []).append((nodo, dist))
 
-            print(f"   ✓ Conectado {punto} a {len(vecinos_seleccionados)} waypoints")
-            return True
+            print(f"   ✓ Conectado {punto} a {len(mejores_vecinos[:3])} waypoints")
+            return nodo
 
         print(f"   ❌ No se pudo conectar {punto} al roadmap")
-        return False
+        return None
 
-    def _a_estrella_roadmap(self, inicio, meta, conexiones):
-        """A* simplificado sobre el roadmap"""
-        frontera = []
-        heappush(frontera, (0, inicio))
+    def _a_estrella_roadmap(self, inicio, meta, temporales, extra):
+        """
+        A* sobre el roadmap CSR más las aristas temporales de la consulta
+
+        Trabaja con ids de nodo y solo toca los nodos que expande: no depende
+        del tamaño del roadmap. Ignora las aristas marcadas como bloqueadas.
+
+        Returns:
+            (camino, aristas): el camino como lista de celdas y los índices (en
+            pares) de las aristas del roadmap que usa
+        """
+        indptr, vecinos, costos, puntos, arista_csr = self._listas
+        estado = self._estado
+        num_nodos = len(puntos)
+        celdas = {nodo: punto for punto, nodo in temporales.items()}
+
+        def celda(nodo):
+            return puntos[nodo] if nodo < num_nodos else celdas[nodo]
+
+        destino = celda(meta)
+
+        # distancias Manhattan entre celdas: prioridades enteras
+        frontera = nueva_cola(True)
+        frontera.push(0, inicio)
 
         vino_de = {inicio: None}
+        arista_de = {}  # arista del roadmap por la que se llegó (-1 = temporal)
         costo_hasta_ahora = {inicio: 0}
+        cerrados = set()
 
-        # Límite de iteraciones para evitar bucles infinitos
-        max_iteraciones = len(conexiones) * 10
-        iteracion = 0
-
-        while frontera and iteracion < max_iteraciones:
-            iteracion += 1
-            _, actual = heappop(frontera)
+        while frontera:
+            _, actual = frontera.pop()
 
             if actual == meta:
                 break
 
-            # Evitar revisitar nodos ya procesados con mejor costo
-            if actual in costo_hasta_ahora and costo_hasta_ahora.get(actual, float('inf')) < costo_hasta_ahora.get(actual, 0):
+            # Las entradas viejas de la cola se descartan
+            if actual in cerrados:
                 continue
-
-            # Explorar vecinos en el roadmap
-            for vecino in conexiones.get(actual, []):
-                nuevo_costo = costo_hasta_ahora[actual] + self._distancia(actual, vecino)
+            cerrados.add(actual)
+
+            # Explorar vecinos en el roadmap y en las aristas temporales
+            if actual < num_nodos:
+                opciones = [(vecinos[k], costos[k], arista_csr[k])
+                            for k in range(indptr[actual], indptr[actual + 1])
+                            if estado[arista_csr[k]] >= 0]
+            else:
+                opciones = []
+            if actual in extra:
+                opciones += [(vecino, costo, -1) for vecino, costo in extra[actual]]
+            for vecino, costo, arista in opciones:
+                nuevo_costo = costo_hasta_ahora[actual] + costo
 
                 if vecino not in costo_hasta_ahora or nuevo_costo < costo_hasta_ahora[vecino]:
                     costo_hasta_ahora[vecino] = nuevo_costo
-                    prioridad = nuevo_costo + self._distancia(vecino, meta)
-                    heappush(frontera, (prioridad, vecino))
+                    prioridad = nuevo_costo + self._distancia(celda(vecino), destino)
+                    frontera.push(prioridad, vecino)
                     vino_de[vecino] = actual
-
-        if iteracion >= max_iteraciones:
-            print(f"   ⚠️ A* alcanzó límite de {max_iteraciones} iteraciones")
+                    arista_de[vecino] = arista
 
         # Reconstruir camino
         if meta not in vino_de:
-            return []
+            return [], []
 
         camino = []
+        aristas = []
         actual = meta
-        visitados_reconstruccion = set()  # Evitar bucles en reconstrucción
-        while actual is not None and actual not in visitados_reconstruccion:
-            visitados_reconstruccion.add(actual)
-            camino.append(actual)
-            actual = vino_de.get(actual)
+        while actual is not None:
+            camino.append(celda(actual))
+            if arista_de.get(actual, -1) >= 0:
+                aristas.append(arista_de[actual])
+            actual = vino_de[actual]
 
         camino.reverse()
-        return camino
+        return camino, aristas
 
     def _distancia(self, p1, p2):
         """Distancia Manhattan (compatible con el grid)"""
@@ -249,37 +379,6 @@ class PRM:
     def _camino_libre(self, p1, p2):
         """
         Verifica si hay camino libre entre dos puntos (sin montañas)
-        Usa muestreo simple (más rápido que Bresenham)
+        Exacto: revisa todas las celdas que toca el segmento (ver LineaVista)
         """
-        x0, y0 = p1
-        x1, y1 = p2
-
-        # Verificar límites
-        if not (0 <= x0 < self.mapa.size and 0 <= y0 < self.mapa.size):
-            return False
-        if not (0 <= x1 < self.mapa.size and 0 <= y1 < self.mapa.size):
-            return False
-
-        # Verificar que inicio y fin no sean montañas
-        if self.mapa.grid[x0, y0] == 'MONTAÑA' or self.mapa.grid[x1, y1] == 'MONTAÑA':
-            return False
-
-        # Calcular número de puntos a muestrear
-        dist = abs(x1 - x0) + abs(y1 - y0)
-        num_muestras = min(dist + 1, 30)  # Máximo 30 muestras
-
-        # Muestrear puntos a lo largo de la línea
-        for i in range(num_muestras):
-            t = i / max(num_muestras - 1, 1)  # 0 a 1
-            x = int(x0 + t * (x1 - x0))
-            y = int(y0 + t * (y1 - y0))
-
-            # Verificar límites
-            if not (0 <= x < self.mapa.size and 0 <= y < self.mapa.size):
-                return False
-
-            # Verificar obstáculo
-            if self.mapa.grid[x, y] == 'MONTAÑA':
-                return False
-
-        return True
\ No newline at end of file
+        return self.mapa.obtener_linea_vista().libre(p1, p2)
@@ -0,0 +1,83 @@
+"""
+Conexión del roadmap de PRM en paralelo (franjas de cubetas repartidas entre procesos)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from algoritmos.indice_espacial import IndiceEspacial
+from algoritmos.linea_vista import LineaVista
+from algoritmos.memoria_compartida import compartido, conectar, compartir
+
+
+def _conectar_franja(fila_inicio, fila_fin, radio, comprobar):
+    """
+    Pares a distancia <= radio cuyo primer punto está en las filas de cubetas [inicio, fin)
+
+    Cada trabajador arma una sola vez el índice y el comprobador sobre los
+    arreglos compartidos (la máscara de montañas no se copia).
+    Con comprobar=True solo devuelve los pares con línea de vista libre.
+    """
+    nodos = compartido['nodos']
+    if '_indice' not in compartido:
+        compartido['_indice'] = IndiceEspacial(nodos, radio)
+        compartido['_linea'] = LineaVista(compartido['bloqueado'])
+
+    pares = compartido['_indice'].pares_en_radio(radio, filas=(fila_inicio, fila_fin))
+    if comprobar:
+        pares = pares[compartido['_linea'].comprobar(nodos[pares[:, 0]], nodos[pares[:, 1]])]
+    return pares
+
+
+class RoadmapParalelo:
+    def __init__(self, nodos, bloqueado, radio, procesos=None, franjas=None):
+        """
+        Reparte la conexión de los waypoints por zonas del mapa
+
+        Args:
+            nodos: Arreglo (N, 2) de waypoints sin repetir
+            bloqueado: Máscara (size, size) de montañas (MapaJuego.obtener_obstaculos())
+            radio: Radio de conexión (también el lado de las cubetas del índice)
+            procesos: Procesos trabajadores (None = todos los núcleos, 1 = sin pool)
+            franjas: Cantidad de franjas de filas de cubetas (por defecto 4 por proceso)
+        """
+        self.procesos = procesos or os.cpu_count() or 1
+        self.nodos = np.asarray(nodos, dtype=np.int64).reshape(-1, 2)
+        self.bloqueado = bloqueado
+        self.radio = radio
+
+        # franjas con parecida cantidad de puntos (cortadas entre filas de cubetas)
+        filas = self.nodos[:, 0] // max(1, int(radio))
+        acumulado = np.cumsum(np.bincount(filas, minlength=1))
+        cantidad = franjas or self.procesos * 4
+        cortes = np.searchsorted(acumulado, np.linspace(0, len(self.nodos), cantidad + 1)[1:-1])
+        cortes = np.unique(np.concatenate([[0], cortes + 1, [len(acumulado)]]))
+        self.franjas = [(int(a), int(b)) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+    def conectar(self, comprobar=True):
+        """
+        Busca (y comprueba) los pares de todas las franjas y los junta
+
+        Returns:
+            Arreglo (P, 2) de pares de índices en nodos, i < j, ordenado por (i, j)
+            (el mismo que da la construcción en un solo proceso)
+        """
+        arreglos = {'nodos': self.nodos, 'bloqueado': self.bloqueado}
+        inicios, fines = zip(*self.franjas) if self.franjas else ((), ())
+        radios = [self.radio] * len(self.franjas)
+        comprobaciones = [comprobar] * len(self.franjas)
+
+        if self.procesos == 1:
+            compartido.update(arreglos)
+            try:
+                partes = list(map(_conectar_franja, inicios, fines, radios, comprobaciones))
+            finally:
+                compartido.clear()
+        else:
+            with compartir(arreglos) as (_, descripciones):
+                with ProcessPoolExecutor(self.procesos, initializer=conectar,
+                                         initargs=(descripciones,)) as pool:
+                    partes = list(pool.map(_conectar_franja, inicios, fines, radios, comprobaciones))
+
+        pares = np.concatenate(partes) if partes else np.zeros((0, 2), dtype=np.int64)
+        return pares[np.lexsort((pares[:, 1], pares[:, 0]))]
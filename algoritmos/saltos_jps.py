@@ -0,0 +1,52 @@
+"""
+Paradas precalculadas de los saltos verticales de JPS (una vez por versión del mapa)
+"""
+
+import numpy as np
+
+
+class SaltosJPS:
+    def __init__(self, mapa_juego):
+        """
+        Para cada celda y sentido vertical, la primera celda donde un salto se detiene
+
+        Usa los mismos ids que Busquedas._costos_con_borde: la celda (x, y) es
+        (x + 1) * ancho + (y + 1). Un salto vertical por un tramo de coste c
+        se detiene en la primera celda s que tiene otro coste que la anterior
+        (otro terreno o el borde) o que tiene un vecino forzado o una salida
+        lateral a otro terreno. Nada de eso depende de desde dónde empieza el
+        salto, así que se calcula para todo el mapa con NumPy y cada salto
+        pasa a ser una consulta: abajo[id] / arriba[id] es la primera parada
+        a partir de id (incluida) hacia x creciente / decreciente.
+
+        Args:
+            mapa_juego: Referencia al mapa del juego
+        """
+        self.ancho = mapa_juego.size + 2
+        costos = np.pad(mapa_juego.obtener_costos().astype(float), 1, constant_values=np.inf)
+        filas = np.arange(self.ancho)[:, None]
+
+        self.abajo = self._proximas(costos, filas, 1)
+        self.arriba = self._proximas(costos, filas, -1)
+
+    def _proximas(self, costos, filas, sentido):
+        """Lista plana con el id de la primera parada desde cada celda en el sentido dado"""
+        ancho = self.ancho
+        anterior = np.roll(costos, sentido, axis=0)  # coste de la celda de la que se viene
+
+        parada = costos != anterior
+        for lado in (1, -1):
+            costo_lado = np.roll(costos, -lado, axis=1)
+            anterior_lado = np.roll(anterior, -lado, axis=1)
+            forzado = (costo_lado == costos) & (anterior_lado != costos)
+            salida = (costo_lado != costos) & (costo_lado != np.inf)
+            parada |= forzado | salida
+        parada[0] = parada[-1] = True  # el borde siempre corta
+
+        # fila de la primera parada desde cada celda (acumulando en el sentido contrario)
+        candidatas = np.where(parada, filas, ancho if sentido > 0 else -1)
+        if sentido > 0:
+            proxima = np.minimum.accumulate(candidatas[::-1], axis=0)[::-1]
+        else:
+            proxima = np.maximum.accumulate(candidatas, axis=0)
+        return (proxima * ancho + np.arange(ancho)).ravel().tolist()
@@ -0,0 +1,86 @@
+"""
+Registro compacto de la frontera de una búsqueda (para animación)
+"""
+
+from array import array
+
+
+class TrazaBusqueda:
+    ENTRA = 0  # push a la frontera
+    SALE = 1   # pop de la frontera
+
+    def __init__(self, ancho, borde=0):
+        """
+        Guarda los eventos push/pop de la frontera en arreglos planos
+
+        Args:
+            ancho: Ancho del grid sobre el que se numeran los ids (id = x * ancho + y)
+            borde: Celdas de borde añadidas al grid (se restan al decodificar)
+        """
+        self.ancho = ancho
+        self.borde = borde
+
+        self.eventos = array('b')  # ENTRA / SALE
+        self.nodos = array('q')    # id del nodo de cada evento
+        self.marcas = array('q')   # número de eventos al cerrar cada expansión
+
+        # estado de la última reconstrucción (para avanzar sin repetir)
+        self._contador = {}
+        self._posicion = 0
+
+    def entra(self, nodo):
+        self.eventos.append(self.ENTRA)
+        self.nodos.append(nodo)
+
+    def sale(self, nodo):
+        self.eventos.append(self.SALE)
+        self.nodos.append(nodo)
+
+    def marcar(self):
+        """Cierra un cuadro: la frontera tal como está tras expandir un nodo"""
+        self.marcas.append(len(self.eventos))
+
+    def copia(self):
+        """
+        Traza con los mismos eventos y su propio cursor de reproducción
+
+        Los arreglos se comparten: una traza terminada ya no recibe eventos.
+        """
+        traza = TrazaBusqueda(self.ancho, self.borde)
+        traza.eventos, traza.nodos, traza.marcas = self.eventos, self.nodos, self.marcas
+        return traza
+
+    def __len__(self):
+        return len(self.marcas)
+
+    def __getitem__(self, paso):
+        """Compatibilidad con la lista de estados: traza[paso] es la frontera en ese paso"""
+        return self.reconstruir_frontera(paso)
+
+    def reconstruir_frontera(self, paso):
+        """Reproduce los eventos hasta el paso dado y devuelve los nodos (x, y) en la frontera"""
+        if paso < 0:
+            paso += len(self.marcas)
+        fin = self.marcas[paso]
+
+        # si se pide un paso anterior al último reconstruido, empezar de cero
+        if fin < self._posicion:
+            self._contador = {}
+            self._posicion = 0
+
+        contador = self._contador
+        for i in range(self._posicion, fin):
+            nodo = self.nodos[i]
+            if self.eventos[i] == self.ENTRA:
+                contador[nodo] = contador.get(nodo, 0) + 1
+            elif contador[nodo] == 1:
+                del contador[nodo]
+            else:
+                contador[nodo] -= 1
+        self._posicion = fin
+
+        frontera = []
+        for nodo, veces in contador.items():
+            x, y = divmod(nodo, self.ancho)
+            frontera.extend([(x - self.borde, y - self.borde)] * veces)
+        return frontera
@@ -0,0 +1,127 @@
+"""
+Union-Find (conjuntos disjuntos) sobre ids enteros, con arreglos NumPy
+"""
+
+import numpy as np
+
+
+class UnionFind:
+    def __init__(self, n):
+        """
+        n conjuntos {0}, {1}, ..., {n - 1}
+
+        find es iterativo (no hay límite de recursión) y comprime el camino;
+        union une por rango. union_lote procesa muchas uniones seguidas, en
+        orden, como las necesita Kruskal; unir_todos une un lote entero sin
+        bucle de Python cuando el orden no importa.
+        """
+        self.padre = np.arange(n, dtype=np.int64)
+        self.rango = np.zeros(n, dtype=np.int8)
+        self.componentes = n
+
+    def find(self, x):
+        """Raíz del conjunto de x (comprime el camino recorrido)"""
+        padre = self.padre
+        raiz = x
+        while padre[raiz] != raiz:
+            raiz = padre[raiz]
+        while padre[x] != raiz:
+            padre[x], x = raiz, padre[x]
+        return int(raiz)
+
+    def union(self, x, y):
+        """Une los conjuntos de x e y; devuelve False si ya estaban juntos"""
+        rx, ry = self.find(x), self.find(y)
+        if rx == ry:
+            return False
+        if self.rango[rx] < self.rango[ry]:
+            rx, ry = ry, rx
+        self.padre[ry] = rx
+        if self.rango[rx] == self.rango[ry]:
+            self.rango[rx] += 1
+        self.componentes -= 1
+        return True
+
+    def union_lote(self, a, b, max_uniones=None):
+        """
+        Une a[k] con b[k] para cada k, en orden
+
+        Args:
+            a, b: Arreglos de ids del mismo largo
+            max_uniones: Detenerse después de esta cantidad de uniones exitosas
+
+        Returns:
+            Arreglo bool: True en las posiciones que unieron dos conjuntos distintos
+        """
+        # el bucle trabaja sobre listas (mucho más rápido que indexar NumPy de a uno)
+        padre = self.padre.tolist()
+        rango = self.rango.tolist()
+        a = np.asarray(a).tolist()
+        b = np.asarray(b).tolist()
+        unidas = np.zeros(len(a), dtype=bool)
+        limite = len(a) if max_uniones is None else max_uniones
+        uniones = 0
+
+        for k in range(len(a)):
+            if uniones >= limite:
+                break
+
+            rx = a[k]
+            while padre[rx] != rx:
+                padre[rx] = padre[padre[rx]]  # compresión por mitades
+                rx = padre[rx]
+            ry = b[k]
+            while padre[ry] != ry:
+                padre[ry] = padre[padre[ry]]
+                ry = padre[ry]
+            if rx == ry:
+                continue
+
+            if rango[rx] < rango[ry]:
+                rx, ry = ry, rx
+            padre[ry] = rx
+            if rango[rx] == rango[ry]:
+                rango[rx] += 1
+            unidas[k] = True
+            uniones += 1
+
+        self.padre[:] = padre
+        self.rango[:] = rango
+        self.componentes -= uniones
+        return unidas
+
+    def unir_todos(self, a, b):
+        """
+        Une a[k] con b[k] para todos los k a la vez (el orden no importa)
+
+        Por rondas: cada raíz con una arista hacia otro conjunto se cuelga de
+        la menor raíz vecina (padre siempre menor que el hijo, sin ciclos) y
+        luego se comprimen los caminos. Las aristas ya internas se descartan.
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        while len(a):
+            ra, rb = self.raices(a), self.raices(b)
+            distintas = ra != rb
+            a, b, ra, rb = a[distintas], b[distintas], ra[distintas], rb[distintas]
+            if not len(a):
+                break
+            np.minimum.at(self.padre, np.maximum(ra, rb), np.minimum(ra, rb))
+
+        self.componentes = int(np.count_nonzero(self.padre == np.arange(len(self.padre))))
+
+    def raices(self, ids=None):
+        """
+        Raíz de cada id (todos si ids es None), vectorizado
+
+        Aplica padre = padre[padre] hasta que no cambia, así que además deja
+        todos los caminos comprimidos.
+        """
+        padre = self.padre
+        while True:
+            abuelo = padre[padre]
+            if np.array_equal(abuelo, padre):
+                break
+            padre = abuelo
+        self.padre = padre
+        return padre if ids is None else padre[np.asarray(ids)]
@@ -5,5 +5,6 @@ VENTANA_ANCHO = TAM_CUADRICULA * TAM_CELDA + 300 # espacio para el panel de cont
 VENTANA_ALTO = TAM_CUADRICULA * TAM_CELDA
 
 FPS=30
+MS_BUSQUEDA = 10 #milisegundos de busqueda por cuadro (la ventana no se congela)
 
 #VELOCIDAD_ANIM = 5
\ No newline at end of file
@@ -16,9 +16,12 @@ def main():
     print("1. Click en el mapa para colocar a Jerry")
     print("2. Click nuevamente para colocar la a Tom")
     print("3. Usa los botones del panel para ejecutar algoritmos")
+    print("4. Click otra vez en el mapa para mover a Jerry (Tom replanifica)")
     print("\nAlgoritmos disponibles:")
     print("- A*: Encuentra el camino con menor coste total")
     print("- Greedy: Rápido pero no siempre óptimo")
+    print("- Bidireccional: A* desde Tom y desde Jerry a la vez")
+    print("- Campo de flujo: Tom sigue las direcciones precalculadas hacia Jerry")
     print("- MST (Prim/Kruskal): Árbol de expansión mínima")
     print("- Generación Perlin Noise: Terreno realista")
     print("=" * 70)
@@ -0,0 +1,60 @@
+"""
+Adyacencia precalculada del mapa en formato CSR
+"""
+
+import numpy as np
+from modelos.terreno import TIPOS_TERRENO
+
+
+class Adyacencia:
+    # mismo orden que MapaJuego.obtener_vecinos
+    DIRECCIONES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+    def __init__(self, grid):
+        """
+        Construye la adyacencia (4 direcciones) de un grid de codigos
+
+        Cada celda (x, y) tiene id = x * size + y. Sus vecinos transitables son
+        vecinos[indptr[id]:indptr[id + 1]] y el coste de entrar a cada uno
+        está en la misma posición de costos.
+        """
+        self.size = grid.shape[0]
+        n = self.size
+
+        transitable = grid != TIPOS_TERRENO.MONTAÑA
+        ids = np.arange(n * n, dtype=np.int32).reshape(n, n)
+
+        # -1 = sin vecino en esa dirección
+        vecinos = np.full((n, n, len(self.DIRECCIONES)), -1, dtype=np.int32)
+        for k, (dx, dy) in enumerate(self.DIRECCIONES):
+            origen_x = slice(max(0, -dx), n - max(0, dx))
+            origen_y = slice(max(0, -dy), n - max(0, dy))
+            destino_x = slice(max(0, dx), n - max(0, -dx))
+            destino_y = slice(max(0, dy), n - max(0, -dy))
+
+            vecinos[origen_x, origen_y, k] = np.where(transitable[destino_x, destino_y],
+                                                      ids[destino_x, destino_y], -1)
+
+        vecinos = vecinos.reshape(n * n, len(self.DIRECCIONES))
+        validos = vecinos >= 0
+
+        self.indptr = np.zeros(n * n + 1, dtype=np.int64)
+        np.cumsum(validos.sum(axis=1), out=self.indptr[1:])
+        self.vecinos = vecinos[validos]
+        self.costos = TIPOS_TERRENO.COSTOS[grid].ravel()[self.vecinos]
+        if TIPOS_TERRENO.COSTOS_ENTEROS:
+            # enteros solo si lo son todos: un coste fraccionario no se trunca
+            self.costos = self.costos.astype(np.int32)
+
+        self._listas = None
+
+    def como_listas(self):
+        """Devuelve (indptr, vecinos, costos) como listas de Python para los bucles de búsqueda"""
+        if self._listas is None:
+            self._listas = (self.indptr.tolist(), self.vecinos.tolist(), self.costos.tolist())
+        return self._listas
+
+    def vecinos_de(self, nodo):
+        """Ids de los vecinos transitables de un nodo"""
+        indptr, vecinos, _ = self.como_listas()
+        return vecinos[indptr[nodo]:indptr[nodo + 1]]
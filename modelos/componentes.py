@@ -0,0 +1,47 @@
+"""
+Regiones conexas del mapa (celdas alcanzables entre sí sin cruzar montañas)
+"""
+
+import numpy as np
+from modelos.terreno import TIPOS_TERRENO
+from algoritmos.union_find import UnionFind
+
+
+class Componentes:
+    def __init__(self, grid):
+        """
+        Etiqueta cada celda con su región conexa (4 direcciones)
+
+        etiquetas[x, y] va de 0 a cantidad - 1 y vale -1 en las montañas.
+        Como entrar a una celda transitable nunca es imposible, dos celdas
+        tienen camino entre sí si y solo si comparten etiqueta.
+        """
+        n = grid.shape[0]
+        transitable = grid != TIPOS_TERRENO.MONTAÑA
+        ids = np.arange(n * n, dtype=np.int64).reshape(n, n)
+
+        # aristas hacia la derecha y hacia abajo entre celdas transitables
+        derecha = transitable[:, :-1] & transitable[:, 1:]
+        abajo = transitable[:-1, :] & transitable[1:, :]
+        conjuntos = UnionFind(n * n)
+        conjuntos.unir_todos(np.concatenate([ids[:, :-1][derecha], ids[:-1, :][abajo]]),
+                             np.concatenate([ids[:, 1:][derecha], ids[1:, :][abajo]]))
+
+        etiquetas = np.full(n * n, -1, dtype=np.int32)
+        validas = transitable.ravel()
+        _, etiquetas[validas] = np.unique(conjuntos.raices()[validas], return_inverse=True)
+
+        self.size = n
+        self.etiquetas = etiquetas.reshape(n, n)
+        self.cantidad = int(etiquetas.max()) + 1 if validas.any() else 0
+        # lista plana para consultar sin pasar por NumPy
+        self._etiquetas = etiquetas.tolist()
+
+    def etiqueta(self, celda):
+        """Región de la celda (x, y), -1 si es montaña"""
+        return self._etiquetas[celda[0] * self.size + celda[1]]
+
+    def conectadas(self, a, b):
+        """True si hay camino entre las celdas a y b (O(1))"""
+        region = self.etiqueta(a)
+        return region >= 0 and region == self.etiqueta(b)
@@ -3,81 +3,220 @@ Representa el mapa del juego con diferentes tipos de terreno
 """
 
 import numpy as np
-import random
+from itertools import count
 from config import TAM_CUADRICULA
 from modelos.terreno import TIPOS_TERRENO
+from modelos.adyacencia import Adyacencia
+from modelos.componentes import Componentes
+from algoritmos.landmarks import Landmarks
+from algoritmos.busqueda_en_curso import agotar
+from algoritmos.campo_flujo import CampoFlujo
+from algoritmos.linea_vista import LineaVista
+from algoritmos.saltos_jps import SaltosJPS
 
 
 class MapaJuego:
-    def __init__(self, size=TAM_CUADRICULA):
+    # contador global: cada grid (nuevo, cargado o editado) recibe una versión distinta
+    _versiones = count()
+    # campos de flujo guardados por mapa (uno por meta)
+    MAX_CAMPOS_FLUJO = 8
+
+    def __init__(self, size=TAM_CUADRICULA, semilla=None):
         self.size = size
+        self.rng = np.random.default_rng(semilla)
         self.grid = self._generar_terreno()
         self.inicio = None
         self.meta = None
+        self._adyacencia = None
+        self._costos_con_borde = None
+        self._listas_trabajo = None
+        self._saltos_jps = None
+        self._componentes = None
+        self._linea_vista = None
+        self._landmarks = None
+        self._campos_flujo = {}
+        self.version = next(MapaJuego._versiones)
 
     def _generar_terreno(self):
-        """Genera un mapa con terrenos variados"""
-        grid = np.full((self.size, self.size), 'LLANURA', dtype=object)
+        """Genera un mapa con terrenos variados (vectorizado con NumPy)"""
+        grid = np.full((self.size, self.size), TIPOS_TERRENO.LLANURA, dtype=np.uint8)
+
+        # Número de grupos proporcional al área (mismas cantidades en el mapa 20x20)
+        escala = (self.size * self.size) / (TAM_CUADRICULA * TAM_CUADRICULA)
+
+        def cantidad(base):
+            return max(1, int(round(base * escala)))
+
+        bloque = [(dx, dy) for dx in range(-1, 2) for dy in range(-1, 2)]
 
         # Añadir bosques (grupos)
-        for _ in range(15):
-            x, y = random.randint(0, self.size - 1), random.randint(0, self.size - 1)
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.size and 0 <= ny < self.size and random.random() > 0.5:
-                        grid[nx, ny] = 'BOSQUE'
+        self._pintar_grupos(grid, self._centros(cantidad(15)), bloque, 0.5, TIPOS_TERRENO.BOSQUE)
 
         # Añadir pantanos
-        for _ in range(10):
-            x, y = random.randint(0, self.size - 1), random.randint(0, self.size - 1)
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.size and 0 <= ny < self.size and random.random() > 0.6:
-                        grid[nx, ny] = 'PANTANO'
-
-        # Añadir agua (ríos)
-        for _ in range(3):
-            x = random.randint(0, self.size - 1)
-            y = random.randint(0, self.size - 1)
-            direccion = random.choice([(0, 1), (1, 0), (1, 1)])
-            for _ in range(random.randint(5, 10)):
-                if 0 <= x < self.size and 0 <= y < self.size:
-                    grid[x, y] = 'AGUA'
-                x += direccion[0]
-                y += direccion[1]
-
-        # Añadir montañas
-        for _ in range(8):
-            x, y = random.randint(0, self.size - 1), random.randint(0, self.size - 1)
-            grid[x, y] = 'MONTAÑA'
-            if random.random() > 0.5:
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.size and 0 <= ny < self.size and random.random() > 0.5:
-                        grid[nx, ny] = 'MONTAÑA'
+        self._pintar_grupos(grid, self._centros(cantidad(10)), bloque, 0.6, TIPOS_TERRENO.PANTANO)
+
+        # Añadir agua (ríos): todos los ríos avanzan a la vez, paso a paso
+        num_rios = cantidad(3)
+        x, y = self._centros(num_rios)
+        direcciones = np.array([(0, 1), (1, 0), (1, 1)])[self.rng.integers(0, 3, num_rios)]
+        largos = self.rng.integers(5, 11, num_rios)
+        pasos = np.arange(10)[:, None]
+        rx = x + pasos * direcciones[:, 0]
+        ry = y + pasos * direcciones[:, 1]
+        mascara = (pasos < largos) & (rx < self.size) & (ry < self.size)
+        grid[rx[mascara], ry[mascara]] = TIPOS_TERRENO.AGUA
+
+        # Añadir montañas: la celda central siempre, la cruz en la mitad de los grupos
+        x, y = self._centros(cantidad(8))
+        grid[x, y] = TIPOS_TERRENO.MONTAÑA
+        con_cruz = self.rng.random(len(x)) > 0.5
+        self._pintar_grupos(grid, (x[con_cruz], y[con_cruz]),
+                            [(0, 1), (1, 0), (0, -1), (-1, 0)], 0.5, TIPOS_TERRENO.MONTAÑA)
 
         return grid
 
+    def _centros(self, cantidad):
+        """Coordenadas (x, y) aleatorias para los centros de los grupos"""
+        return (self.rng.integers(0, self.size, cantidad),
+                self.rng.integers(0, self.size, cantidad))
+
+    def _pintar_grupos(self, grid, centros, desplazamientos, probabilidad, tipo):
+        """Pinta cada desplazamiento alrededor de todos los centros a la vez con probabilidad dada"""
+        x, y = centros
+        for dx, dy in desplazamientos:
+            nx, ny = x + dx, y + dy
+            mascara = ((0 <= nx) & (nx < self.size) & (0 <= ny) & (ny < self.size) &
+                       (self.rng.random(len(x)) > probabilidad))
+            grid[nx[mascara], ny[mascara]] = tipo
+
     def obtener_costo(self, x, y):
         """Obtiene el coste de movimiento de una celda"""
         if not (0 <= x < self.size and 0 <= y < self.size):
             return float('inf')
-        return TIPOS_TERRENO.INFO[self.grid[x, y]]['costo']
+        return TIPOS_TERRENO.COSTO_POR_CODIGO[self.grid[x, y]]
 
     def obtener_vecinos(self, x, y):
         """Obtiene vecinos válidos (4 direcciones)"""
-        vecinos = []
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size:
-                if self.grid[nx, ny] != 'MONTAÑA':
-                    vecinos.append((nx, ny))
-        return vecinos
+        return [divmod(v, self.size) for v in self.obtener_adyacencia().vecinos_de(x * self.size + y)]
+
+    def obtener_adyacencia(self):
+        """Adyacencia CSR del mapa, se construye una sola vez por mapa"""
+        if self._adyacencia is None:
+            self._adyacencia = Adyacencia(self.grid)
+        return self._adyacencia
+
+    def obtener_costos_con_borde(self):
+        """
+        Costes del mapa con un borde de montañas alrededor, aplanados en una lista
+
+        Devuelve (costos, ancho): la celda (x, y) tiene id (x + 1) * ancho + (y + 1).
+        Los costes son los de COSTO_POR_CODIGO (enteros de Python si lo son).
+        Se arma una sola vez por versión del mapa.
+        """
+        if self._costos_con_borde is None:
+            ancho = self.size + 2
+            codigos = np.full((ancho, ancho), TIPOS_TERRENO.MONTAÑA, dtype=np.uint8)
+            codigos[1:-1, 1:-1] = self.grid
+            costos = np.array(TIPOS_TERRENO.COSTO_POR_CODIGO, dtype=object)[codigos.ravel()]
+            self._costos_con_borde = (costos.tolist(), ancho)
+        return self._costos_con_borde
+
+    def obtener_listas_trabajo(self):
+        """
+        Listas g, padre y cerrado de A* rápido sobre los ids de obtener_costos_con_borde
+
+        Se crean una vez y viven lo que las demás cachés del mapa; quien las usa
+        debe dejarlas como las encontró (inf, -1, False).
+        """
+        if self._listas_trabajo is None:
+            total = (self.size + 2) ** 2
+            self._listas_trabajo = ([float('inf')] * total, [-1] * total, [False] * total)
+        return self._listas_trabajo
+
+    def obtener_saltos_jps(self):
+        """Paradas de los saltos verticales de JPS (se calculan una vez por versión del mapa)"""
+        if self._saltos_jps is None:
+            self._saltos_jps = SaltosJPS(self)
+        return self._saltos_jps
+
+    def obtener_componentes(self):
+        """Regiones conexas del mapa, se etiquetan una sola vez por versión"""
+        if self._componentes is None:
+            self._componentes = Componentes(self.grid)
+        return self._componentes
+
+    def mismo_componente(self, a, b):
+        """True si existe algún camino entre las celdas a y b (sin buscarlo)"""
+        return self.obtener_componentes().conectadas(a, b)
+
+    def obtener_linea_vista(self):
+        """Comprobador de línea de vista del mapa (guarda sus resultados hasta que el mapa cambia)"""
+        if self._linea_vista is None:
+            self._linea_vista = LineaVista(self.obtener_obstaculos())
+        return self._linea_vista
+
+    def obtener_landmarks(self, cantidad=8):
+        """Landmarks ALT del mapa con sus tablas de distancias (se calculan una vez por mapa)"""
+        return agotar(self.obtener_landmarks_pasos(cantidad))
+
+    def obtener_landmarks_pasos(self, cantidad=8):
+        """Generador de obtener_landmarks: cede el control mientras los calcula y los devuelve"""
+        if self._landmarks is None or self._landmarks.cantidad < cantidad:
+            version = self.version
+            landmarks = yield from Landmarks.pasos(self, cantidad)
+            if version != self.version:
+                return landmarks  # el mapa cambió mientras tanto: no se guardan
+            self._landmarks = landmarks
+        return self._landmarks
+
+    def obtener_campo_flujo(self, meta=None):
+        """Campo de flujo hacia meta (por defecto la meta actual), se calcula una vez por meta"""
+        meta = meta if meta is not None else self.meta
+        campo = self._campos_flujo.get(meta)
+        if campo is None:
+            if len(self._campos_flujo) >= self.MAX_CAMPOS_FLUJO:
+                del self._campos_flujo[next(iter(self._campos_flujo))]
+            campo = self._campos_flujo[meta] = CampoFlujo(self, meta)
+        return campo
+
+    def establecer_terreno(self, x, y, tipo):
+        """Cambia el terreno de una celda (codigo o nombre) e invalida las cachés"""
+        if isinstance(tipo, str):
+            tipo = TIPOS_TERRENO.CODIGOS[tipo]
+        self.grid[x, y] = tipo
+        self._invalidar_cache()
+
+    def _invalidar_cache(self):
+        """Descarta las estructuras precalculadas del grid actual y cambia la versión"""
+        self._adyacencia = None
+        self._costos_con_borde = None
+        self._listas_trabajo = None
+        self._saltos_jps = None
+        self._componentes = None
+        self._linea_vista = None
+        self._landmarks = None
+        self._campos_flujo = {}
+        self.version = next(MapaJuego._versiones)
+
+    def obtener_terreno(self, x, y):
+        """Obtiene el nombre del terreno de una celda ('LLANURA', 'MONTAÑA', ...)"""
+        return TIPOS_TERRENO.NOMBRES[self.grid[x, y]]
+
+    def obtener_grid_nombres(self):
+        """Devuelve una copia del grid con los nombres de terreno (compatibilidad)"""
+        return np.array(TIPOS_TERRENO.NOMBRES, dtype=object)[self.grid]
+
+    def obtener_costos(self):
+        """Devuelve el coste de cada celda como arreglo float (montaña = inf)"""
+        return TIPOS_TERRENO.COSTOS[self.grid]
+
+    def obtener_obstaculos(self):
+        """Devuelve la máscara booleana de celdas bloqueadas (montañas)"""
+        return self.grid == TIPOS_TERRENO.MONTAÑA
 
     def cargar_mapa_generado(self, mapa_generado):
-        """Carga un mapa generado proceduralmente"""
-        self.grid = mapa_generado
+        """Carga un mapa generado proceduralmente (codigos uint8 o nombres)"""
+        self.grid = TIPOS_TERRENO.codificar(mapa_generado)
         self.inicio = None
-        self.meta = None
\ No newline at end of file
+        self.meta = None
+        self._invalidar_cache()
\ No newline at end of file
@@ -1,8 +1,20 @@
 # diccionario de terrenos ; tipos y sus costes
 import pygame
 import os
+import numpy as np
 
 class TIPOS_TERRENO:
+    #codigos enteros (uint8) con los que se guarda el grid
+    LLANURA = 0
+    BOSQUE = 1
+    PANTANO = 2
+    AGUA = 3
+    MONTAÑA = 4
+
+    #nombre de cada codigo (indice = codigo)
+    NOMBRES = ['LLANURA', 'BOSQUE', 'PANTANO', 'AGUA', 'MONTAÑA']
+    CODIGOS = {nombre: codigo for codigo, nombre in enumerate(NOMBRES)}
+
     #definicion de terrenos con textura
     @staticmethod
     def cargar_texturas(tam_celda):
@@ -45,4 +57,31 @@ class TIPOS_TERRENO:
         'PANTANO': {'costo': 3, 'nombre': 'Pantano'},
         'AGUA': {'costo': 5, 'nombre': 'Agua'},
         'MONTAÑA': {'costo': float('inf'), 'nombre': 'Montaña'}
-    }
\ No newline at end of file
+    }
+
+    #coste de cada codigo (indice = codigo), sacado de INFO, para mascaras y costes vectorizados
+    COSTO_POR_CODIGO = [info['costo'] for info in map(INFO.get, NOMBRES)]
+    COSTOS = np.array(COSTO_POR_CODIGO, dtype=float)
+    #todos los costes finitos son enteros (permite colas de cubetas en las busquedas)
+    COSTOS_ENTEROS = bool(np.all(COSTOS[np.isfinite(COSTOS)] % 1 == 0))
+
+    @staticmethod
+    def codificar(grid):
+        """
+        Convierte un grid de codigos enteros o de nombres ('LLANURA', ...) a codigos uint8
+
+        Lanza ValueError si hay un codigo fuera de rango o un nombre desconocido.
+        """
+        grid = np.asarray(grid)
+        if np.issubdtype(grid.dtype, np.integer):
+            if grid.size and (grid.min() < 0 or grid.max() >= len(TIPOS_TERRENO.NOMBRES)):
+                raise ValueError(f"codigo de terreno fuera de rango: {grid.min()}..{grid.max()}")
+            return grid.astype(np.uint8, copy=False)
+
+        # cada nombre distinto se busca una sola vez
+        nombres, inversa = np.unique(grid, return_inverse=True)
+        desconocidos = [str(n) for n in nombres if n not in TIPOS_TERRENO.CODIGOS]
+        if desconocidos:
+            raise ValueError(f"terrenos desconocidos: {', '.join(desconocidos)}")
+        tabla = np.array([TIPOS_TERRENO.CODIGOS[n] for n in nombres], dtype=np.uint8)
+        return tabla[inversa].reshape(grid.shape)
@@ -4,6 +4,7 @@ COLORES = {
     'RUTA_AESTRELLA': (255, 255, 0),   # Amarillo
     'RUTA_GREEDY': (255, 165, 0),      # Naranja
     'RUTA_BFS': (0, 255, 255),         # Cyan
+    'RUTA_BIDIRECCIONAL': (0, 200, 120),  # Verde azulado
     'VISITADOS': (173, 216, 230),      # Azul claro
     'FRONTERA': (255, 192, 203),       # Rosa
     'MST': (255, 0, 255),              # Magenta
@@ -11,6 +11,7 @@ from ui.boton import Boton
 from ui.colores import COLORES
 from config import *
 from algoritmos.prm import PRM
+from algoritmos.dstar_lite import DStarLite
 
 
 class Visualizador:
@@ -51,6 +52,10 @@ class Visualizador:
         self.visitados_bfs = []
         self.costo_bfs = 0
 
+        self.ruta_bidireccional = []
+        self.visitados_bidireccional = []
+        self.costo_bidireccional = 0
+
         self.aristas_mst = []
         self.costo_mst = 0
 
@@ -61,10 +66,21 @@ class Visualizador:
 
         self.prm = None
         self.waypoints_prm = []
+        self.aristas_prm = []
         self.ruta_prm = []
         self.costo_prm = 0
         self.mostrar_prm = False
 
+        # planificador incremental para perseguir a Jerry cuando se mueve
+        self.planificador = None
+
+        # búsquedas reanudables que avanzan en cada cuadro {nombre: BusquedaEnCurso}
+        self.busquedas_en_curso = {}
+
+        # campo de flujo: Tom avanza consultando la dirección de su celda
+        self.campo_flujo = None
+        self.posicion_agente = None
+
         # Animación
         self.paso_animacion = 0
         self.animando = False
@@ -127,10 +143,14 @@ class Visualizador:
                              lambda: self.ejecutar_algoritmo('aestrella')))
         botones.append(Boton(panel_x + 145, 70, 135, 35, "Greedy",
                              lambda: self.ejecutar_algoritmo('greedy')))
-        botones.append(Boton(panel_x, 115, 280, 35, "Comparar A* vs Greedy",
+        botones.append(Boton(panel_x, 115, 135, 35, "A* vs Greedy",
                              lambda: self.ejecutar_algoritmo('comparar')))
-        botones.append(Boton(panel_x, 160, 280, 35, "🗺️ PRM (Roadmap)",
+        botones.append(Boton(panel_x + 145, 115, 135, 35, "Bidireccional",
+                             lambda: self.ejecutar_algoritmo('bidireccional')))
+        botones.append(Boton(panel_x, 160, 135, 35, "🗺️ PRM (Roadmap)",
                              self.ejecutar_prm))
+        botones.append(Boton(panel_x + 145, 160, 135, 35, "Campo de flujo",
+                             self.ejecutar_campo_flujo))
 
         # ALGORITMOS DE GRAFOS
         botones.append(Boton(panel_x, 215, 135, 35, "MST Prim",
@@ -224,7 +244,7 @@ class Visualizador:
             # Mapa con más agua
             import numpy as np
             import random
-            grid = np.full((self.mapa.size, self.mapa.size), 'LLANURA', dtype=object)
+            grid = np.full((self.mapa.size, self.mapa.size), TIPOS_TERRENO.LLANURA, dtype=np.uint8)
 
             # Más ríos y lagos
             for _ in range(8):
@@ -233,21 +253,23 @@ class Visualizador:
                 direccion = random.choice([(0, 1), (1, 0), (1, 1)])
                 for _ in range(random.randint(10, 20)):
                     if 0 <= x < self.mapa.size and 0 <= y < self.mapa.size:
-                        grid[x, y] = 'AGUA'
+                        grid[x, y] = TIPOS_TERRENO.AGUA
                         # Ensanchar río
                         for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
                             nx, ny = x + dx, y + dy
                             if 0 <= nx < self.mapa.size and 0 <= ny < self.mapa.size:
                                 if random.random() > 0.5:
-                                    grid[nx, ny] = 'AGUA'
+                                    grid[nx, ny] = TIPOS_TERRENO.AGUA
                     x += direccion[0]
                     y += direccion[1]
 
             # Agregar obstáculos
             for _ in range(15):
                 x, y = random.randint(0, self.mapa.size - 1), random.randint(0, self.mapa.size - 1)
-                if grid[x, y] != 'AGUA':
-                    grid[x, y] = random.choice(['BOSQUE', 'PANTANO', 'MONTAÑA'])
+                if grid[x, y] != TIPOS_TERRENO.AGUA:
+                    grid[x, y] = random.choice([TIPOS_TERRENO.BOSQUE,
+                                                TIPOS_TERRENO.PANTANO,
+                                                TIPOS_TERRENO.MONTAÑA])
 
             self.mapa.cargar_mapa_generado(grid)
             print("🌊 Mapa con más agua generado")
@@ -274,16 +296,20 @@ class Visualizador:
         if self.mapa.inicio is None or self.mapa.meta is None:
             return
 
-        buscador = Busquedas(self.mapa)
+        self.campo_flujo = None
+        buscador = Busquedas(self.mapa)  # sin traza: la UI solo dibuja los visitados
+        # en laberintos Manhattan casi no guía, usar la cota ALT de los landmarks
+        usar_landmarks = self.modo_juego == 'INTERIOR'
 
+        # las búsquedas avanzan un poco en cada cuadro (ver avanzar_busquedas)
+        self.busquedas_en_curso = {}
         if algoritmo == 'aestrella':
-            self.ruta_aestrella, self.visitados_aestrella, _, self.costo_aestrella = \
-                buscador.a_estrella(self.mapa.inicio, self.mapa.meta)
+            self.busquedas_en_curso['aestrella'] = \
+                buscador.a_estrella_por_pasos(self.mapa.inicio, self.mapa.meta, usar_landmarks)
             self.mostrar_ruta = 'aestrella'
 
         elif algoritmo == 'greedy':
-            self.ruta_greedy, self.visitados_greedy, _, self.costo_greedy = \
-                buscador.greedy(self.mapa.inicio, self.mapa.meta)
+            self.busquedas_en_curso['greedy'] = buscador.greedy_por_pasos(self.mapa.inicio, self.mapa.meta)
             self.mostrar_ruta = 'greedy'
 
         elif algoritmo == 'bfs':
@@ -291,24 +317,59 @@ class Visualizador:
                 buscador.bfs(self.mapa.inicio, self.mapa.meta)
             self.mostrar_ruta = 'bfs'
 
+        elif algoritmo == 'bidireccional':
+            self.busquedas_en_curso['bidireccional'] = \
+                buscador.bidireccional_por_pasos(self.mapa.inicio, self.mapa.meta)
+            self.mostrar_ruta = 'bidireccional'
+
         elif algoritmo == 'comparar':
-            self.ruta_aestrella, self.visitados_aestrella, _, self.costo_aestrella = \
-                buscador.a_estrella(self.mapa.inicio, self.mapa.meta)
-            self.ruta_greedy, self.visitados_greedy, _, self.costo_greedy = \
-                buscador.greedy(self.mapa.inicio, self.mapa.meta)
+            self.busquedas_en_curso['aestrella'] = \
+                buscador.a_estrella_por_pasos(self.mapa.inicio, self.mapa.meta, usar_landmarks)
+            self.busquedas_en_curso['greedy'] = buscador.greedy_por_pasos(self.mapa.inicio, self.mapa.meta)
             self.mostrar_ruta = 'comparar'
 
+        for nombre in self.busquedas_en_curso:
+            setattr(self, f'ruta_{nombre}', [])
+            setattr(self, f'visitados_{nombre}', [])
+
         self.paso_animacion = 0
         self.animando = True
         self.tipo_animacion = algoritmo
+        self.camino_agente = []
+        self.animado_agente = False
+        if self.busquedas_en_curso:
+            self.avanzar_busquedas()
+        else:
+            self._iniciar_agente(algoritmo)
 
-        #preparar la animacion del agente segun algoritmo
+    def avanzar_busquedas(self):
+        """Avanza las búsquedas pendientes sin pasarse de MS_BUSQUEDA por cuadro"""
+        if not self.busquedas_en_curso:
+            return
+
+        presupuesto = MS_BUSQUEDA / len(self.busquedas_en_curso)
+        for nombre, busqueda in list(self.busquedas_en_curso.items()):
+            terminada = busqueda.avanzar(max_ms=presupuesto)
+            setattr(self, f'visitados_{nombre}', busqueda.visitados)
+            if terminada:
+                ruta, _, _, costo = busqueda.resultado
+                setattr(self, f'ruta_{nombre}', ruta)
+                setattr(self, f'costo_{nombre}', costo)
+                del self.busquedas_en_curso[nombre]
+
+        if not self.busquedas_en_curso:
+            self._iniciar_agente(self.tipo_animacion)
+
+    def _iniciar_agente(self, algoritmo):
+        """Prepara la animación de Tom con la ruta del algoritmo"""
         if algoritmo == 'aestrella':
             self.camino_agente = self.ruta_aestrella
         elif algoritmo == 'greedy':
             self.camino_agente = self.ruta_greedy
         elif algoritmo == 'bfs':
             self.camino_agente = self.ruta_bfs
+        elif algoritmo == 'bidireccional':
+            self.camino_agente = self.ruta_bidireccional
         elif algoritmo == 'comparar':
             self.camino_agente = self.ruta_aestrella #anima a* por defecto
 
@@ -316,11 +377,24 @@ class Visualizador:
         self.animado_agente=True
         self.contador_frames=0
 
+    def ejecutar_campo_flujo(self):
+        """Tom persigue a Jerry siguiendo el campo de flujo (sin buscar un camino)"""
+        if self.mapa.inicio is None or self.mapa.meta is None:
+            return
+
+        self.busquedas_en_curso = {}
+        self.campo_flujo = self.mapa.obtener_campo_flujo()
+        self.posicion_agente = self.mapa.inicio
+        self.camino_agente = []
+        self.animado_agente = True
+        self.contador_frames = 0
+        print(f"🧲 Campo de flujo: coste {self.campo_flujo.costo(self.mapa.inicio):.0f}")
 
     def ejecutar_mst(self):
         """Ejecuta el algoritmo de Prim"""
         algoritmo_grafo = AlgoritmosGrafo(self.mapa)
-        self.aristas_mst, self.costo_mst = algoritmo_grafo.prim_mst()
+        aristas, self.costo_mst = algoritmo_grafo.prim_mst()
+        self.aristas_mst = algoritmo_grafo.aristas_a_celdas(aristas)
         self.tipo_mst = "Prim"
         self.mostrar_mst = True
         self.aristas_kruskal = [] #limpiar kruskal
@@ -343,11 +417,12 @@ class Visualizador:
 
         print("\n🗺️ === EJECUTANDO PRM ===")
 
-        # Crear instancia de PRM
-        self.prm = PRM(self.mapa, num_samples=150, radio_conexion=8)
-
-        # PASO 1: Generar roadmap
-        self.waypoints_prm, _ = self.prm.generar_roadmap()
+        # PASO 1: Generar roadmap (solo si no hay uno para esta versión del mapa)
+        if self.prm is None or self.prm.version != self.mapa.version:
+            self.prm = PRM(self.mapa, num_samples=150, radio_conexion=8)
+            self.prm.generar_roadmap()
+        self.waypoints_prm = self.prm.waypoints
+        self.aristas_prm = self.prm.aristas()
 
         # PASO 2: Encontrar camino
         self.ruta_prm, _, _, self.costo_prm = self.prm.encontrar_camino(
@@ -383,6 +458,8 @@ class Visualizador:
         self.visitados_greedy = []
         self.ruta_bfs = []
         self.visitados_bfs = []
+        self.ruta_bidireccional = []
+        self.visitados_bidireccional = []
         self.aristas_mst = []
         self.aristas_kruskal = []
         self.ciclos = []
@@ -391,9 +468,12 @@ class Visualizador:
         self.mostrar_ciclos = False
         self.animando = False
         self.waypoints_prm = []
+        self.aristas_prm = []
         self.ruta_prm = []
         self.mostrar_prm = False
-        self.prm = None
+        self.planificador = None
+        self.campo_flujo = None
+        self.busquedas_en_curso = {}
 
     def dibujar_grid(self):
         """Dibuja el mapa con todos los terrenos"""
@@ -401,7 +481,7 @@ class Visualizador:
             for j in range(self.mapa.size):
                 x = j * TAM_CELDA
                 y = i * TAM_CELDA
-                terreno = self.mapa.grid[i, j]
+                terreno = TIPOS_TERRENO.NOMBRES[self.mapa.grid[i, j]]
                 #color = TIPOS_TERRENO[terreno]['color']
                 if self.texturas_terreno[terreno]:
                     self.pantalla.blit(self.texturas_terreno[terreno], (x, y))
@@ -416,7 +496,8 @@ class Visualizador:
     def dibujar_visitados(self):
         """Dibuja las celdas visitadas durante la búsqueda"""
         # Calcular max_pasos solo con listas que tengan datos
-        listas_visitados = [self.visitados_aestrella, self.visitados_greedy, self.visitados_bfs]
+        listas_visitados = [self.visitados_aestrella, self.visitados_greedy, self.visitados_bfs,
+                            self.visitados_bidireccional]
         listas_con_datos = [len(v) for v in listas_visitados if v]
         max_pasos = max(listas_con_datos) if listas_con_datos else 0
 
@@ -444,6 +525,16 @@ class Visualizador:
                 surf.fill((255, 140, 0))  # Naranja
                 self.pantalla.blit(surf, (x, y))
 
+        if self.mostrar_ruta == 'bidireccional':
+            nodos_mostrar = (self.visitados_bidireccional[:paso_actual] if self.animando
+                             else self.visitados_bidireccional)
+            for nodo in nodos_mostrar:
+                x, y = nodo[1] * TAM_CELDA, nodo[0] * TAM_CELDA
+                surf = pygame.Surface((TAM_CELDA, TAM_CELDA))
+                surf.set_alpha(100)
+                surf.fill(COLORES['VISITADOS'])
+                self.pantalla.blit(surf, (x, y))
+
         """if self.mostrar_ruta == 'bfs':
             for nodo in self.visitados_bfs[:paso_actual]:
                 x, y = nodo[1] * TAM_CELDA, nodo[0] * TAM_CELDA
@@ -478,6 +569,14 @@ class Visualizador:
                        self.ruta_bfs[i + 1][0] * TAM_CELDA + TAM_CELDA // 2)
                 pygame.draw.line(self.pantalla, COLORES['RUTA_BFS'], inicio, fin, 3)
 
+        if self.mostrar_ruta == 'bidireccional' and self.ruta_bidireccional:
+            for i in range(len(self.ruta_bidireccional) - 1):
+                inicio = (self.ruta_bidireccional[i][1] * TAM_CELDA + TAM_CELDA // 2,
+                          self.ruta_bidireccional[i][0] * TAM_CELDA + TAM_CELDA // 2)
+                fin = (self.ruta_bidireccional[i + 1][1] * TAM_CELDA + TAM_CELDA // 2,
+                       self.ruta_bidireccional[i + 1][0] * TAM_CELDA + TAM_CELDA // 2)
+                pygame.draw.line(self.pantalla, COLORES['RUTA_BIDIRECCIONAL'], inicio, fin, 5)
+
     def dibujar_mst(self):
         """Dibuja el Árbol de Expansión Mínima"""
         aristas_dibujar = self.aristas_kruskal if self.aristas_kruskal else self.aristas_mst
@@ -503,24 +602,16 @@ class Visualizador:
             pygame.draw.circle(self.pantalla, (100, 100, 255), (x, y), 3)
 
         # PASO 2: Dibujar conexiones del roadmap (líneas grises)
-        if self.prm and self.prm.conexiones:
-            ya_dibujadas = set()
-            for punto, vecinos in self.prm.conexiones.items():
-                for vecino in vecinos:
-                    # Evitar dibujar la misma línea dos veces
-                    arista = tuple(sorted([punto, vecino]))
-                    if arista in ya_dibujadas:
-                        continue
-                    ya_dibujadas.add(arista)
-
-                    x1 = punto[1] * TAM_CELDA + TAM_CELDA // 2
-                    y1 = punto[0] * TAM_CELDA + TAM_CELDA // 2
-                    x2 = vecino[1] * TAM_CELDA + TAM_CELDA // 2
-                    y2 = vecino[0] * TAM_CELDA + TAM_CELDA // 2
-
-                    # Línea gris suave
-                    pygame.draw.line(self.pantalla, (200, 200, 200),
-                                     (x1, y1), (x2, y2), 1)
+        # cada arista aparece una sola vez en aristas_prm
+        for punto, vecino in self.aristas_prm:
+            x1 = punto[1] * TAM_CELDA + TAM_CELDA // 2
+            y1 = punto[0] * TAM_CELDA + TAM_CELDA // 2
+            x2 = vecino[1] * TAM_CELDA + TAM_CELDA // 2
+            y2 = vecino[0] * TAM_CELDA + TAM_CELDA // 2
+
+            # Línea gris suave
+            pygame.draw.line(self.pantalla, (200, 200, 200),
+                             (x1, y1), (x2, y2), 1)
 
         # PASO 3: Dibujar camino encontrado (línea verde gruesa)
         if self.ruta_prm:
@@ -548,7 +639,9 @@ class Visualizador:
     def dibujar_marcadores(self):
         """Dibuja los marcadores de inicio y objetivo"""
         if self.mapa.inicio:
-            if self.animado_agente and self.camino_agente:
+            if self.campo_flujo is not None:
+                fila, col = self.posicion_agente
+            elif self.animado_agente and self.camino_agente:
                 fila, col = self.camino_agente[self.indice_agente]
             else:
                 fila, col = self.mapa.inicio
@@ -589,6 +682,9 @@ class Visualizador:
             texto = "Click: Colocar Unidad"
         elif self.modo == 'establecer_meta':
             texto = "Click: Colocar Baliza"
+        elif (self.mapa.inicio and self.mapa.meta and
+              not self.mapa.mismo_componente(self.mapa.inicio, self.mapa.meta)):
+            texto = "Sin camino: regiones distintas"
         else:
             texto = "¡Listo para ejecutar!"
 
@@ -623,6 +719,22 @@ class Visualizador:
             self.pantalla.blit(self.fuente_pequena.render(texto_pasos, True, COLORES['TEXTO']),
                                (panel_x + 10, y_offset + 20))
 
+        if self.ruta_bidireccional:
+            y_offset += 50
+            texto_costo = f"Bidireccional - Coste: {self.costo_bidireccional:.0f}"
+            texto_pasos = f"Pasos: {len(self.ruta_bidireccional)}"
+            self.pantalla.blit(self.fuente_pequena.render(texto_costo, True, COLORES['TEXTO']),
+                               (panel_x + 10, y_offset))
+            self.pantalla.blit(self.fuente_pequena.render(texto_pasos, True, COLORES['TEXTO']),
+                               (panel_x + 10, y_offset + 20))
+
+        if self.campo_flujo is not None:
+            y_offset += 50
+            costo_flujo = self.campo_flujo.costo(self.posicion_agente)
+            texto_flujo = f"Campo de flujo - Falta: {costo_flujo:.0f}"
+            self.pantalla.blit(self.fuente_pequena.render(texto_flujo, True, COLORES['TEXTO']),
+                               (panel_x + 10, y_offset))
+
         if self.mostrar_mst:
             y_offset += 50
             costo_mostrar = self.costo_kruskal if self.aristas_kruskal else self.costo_mst
@@ -653,7 +765,7 @@ class Visualizador:
         grid_x = pos[1] // TAM_CELDA
         grid_y = pos[0] // TAM_CELDA
 
-        if self.mapa.grid[grid_x, grid_y] == 'MONTAÑA':
+        if self.mapa.grid[grid_x, grid_y] == TIPOS_TERRENO.MONTAÑA:
             return  # No se puede colocar en montañas
 
         if self.modo == 'establecer_inicio':
@@ -662,6 +774,33 @@ class Visualizador:
         elif self.modo == 'establecer_meta':
             self.mapa.meta = (grid_x, grid_y)
             self.modo = 'listo'
+        elif self.modo == 'listo':
+            self.mover_jerry((grid_x, grid_y))
+
+    def mover_jerry(self, celda):
+        """Mueve a Jerry y repara la ruta de Tom sin repetir toda la búsqueda"""
+        if self.campo_flujo is not None:
+            # Tom sigue desde donde está con el campo de la nueva meta
+            self.mapa.meta = celda
+            self.campo_flujo = self.mapa.obtener_campo_flujo()
+            self.animado_agente = True
+            return
+
+        if self.planificador is None or self.planificador.inicio != self.mapa.inicio:
+            self.planificador = DStarLite(self.mapa, self.mapa.inicio, self.mapa.meta)
+
+        self.mapa.meta = celda
+        self.planificador.mover_meta(celda)
+        self.ruta_aestrella, self.visitados_aestrella, _, self.costo_aestrella = \
+            self.planificador.planear()
+        self.mostrar_ruta = 'aestrella'
+
+        self.paso_animacion = 0
+        self.animando = True
+        self.camino_agente = self.ruta_aestrella
+        self.indice_agente = 0
+        self.animado_agente = True
+        self.contador_frames = 0
 
     def run(self):
         """Bucle principal del juego"""
@@ -687,15 +826,29 @@ class Visualizador:
                 for boton in self.botones:
                     boton.manejar_evento(evento)
 
+            # Avanzar las búsquedas pendientes (con tiempo limitado)
+            self.avanzar_busquedas()
+
             # Actualizar animación
             if self.animando:
                 self.paso_animacion += 1
                 max_pasos = max(len(self.visitados_aestrella),
                                 len(self.visitados_greedy),
-                                len(self.visitados_bfs))
-                if self.paso_animacion >= max_pasos:
+                                len(self.visitados_bfs),
+                                len(self.visitados_bidireccional))
+                if self.paso_animacion >= max_pasos and not self.busquedas_en_curso:
                     self.animando = False
 
+            #animacion de tom con campo de flujo: cada paso es una consulta
+            if self.animado_agente and self.campo_flujo is not None:
+                self.contador_frames += 1
+                if self.contador_frames >= self.frames_por_paso:
+                    self.contador_frames = 0
+                    siguiente = self.campo_flujo.siguiente(self.posicion_agente)
+                    if siguiente == self.posicion_agente:
+                        self.animado_agente = False
+                    self.posicion_agente = siguiente
+
             #animacion de tom
             if self.animado_agente and self.camino_agente:
                 self.contador_frames += 1